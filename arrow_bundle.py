@@ -0,0 +1,67 @@
+"""Draw many straight arrows as a single VMobject
+
+One Arrow per token costs a VMobject for the shaft, another for the tip and a
+GrowArrow per arrow. ArrowBundle keeps every start and end point in NumPy
+arrays and writes all shafts and triangular tips as subpaths of one VMobject,
+and GrowArrowBundle grows them all from their starts with one array update
+per frame. All arrows in a bundle share one stroke width and color.
+"""
+from manim import *
+import numpy as np
+
+
+def _line_curves(starts, ends):
+    """Cubic Bézier control points of straight lines, shape (n, 4, 3)"""
+    t = np.array([0, 1 / 3, 2 / 3, 1])[np.newaxis, :, np.newaxis]
+    return starts[:, np.newaxis, :] + t * (ends - starts)[:, np.newaxis, :]
+
+
+class ArrowBundle(VMobject):
+    # Control points per arrow: one shaft curve plus three tip edges
+    POINTS_PER_ARROW = 16
+
+    def __init__(self, starts, ends, buff=MED_SMALL_BUFF, tip_length=DEFAULT_ARROW_TIP_LENGTH,
+                 max_tip_length_to_length_ratio=0.25, color=WHITE, stroke_width=6, **kwargs):
+        super().__init__(color=color, stroke_width=stroke_width, fill_opacity=1, **kwargs)
+        starts = np.array(starts, dtype=float).reshape(-1, 3)
+        ends = np.array(ends, dtype=float).reshape(-1, 3)
+        # Pull both ends in by buff along each arrow, like Arrow does
+        directions = ends - starts
+        lengths = np.linalg.norm(directions, axis=1, keepdims=True)
+        units = directions / np.where(lengths == 0, 1, lengths)
+        self.starts = starts + units * buff
+        self.ends = ends - units * buff
+        lengths = np.maximum(lengths - 2 * buff, 0)
+
+        tip_lengths = np.minimum(tip_length, max_tip_length_to_length_ratio * lengths)
+        normals = np.stack([-units[:, 1], units[:, 0], np.zeros(len(units))], axis=1)
+        tip_bases = self.ends - units * tip_lengths
+        left = tip_bases + normals * tip_lengths / 2
+        right = tip_bases - normals * tip_lengths / 2
+
+        curves = np.stack([
+            _line_curves(self.starts, tip_bases),
+            _line_curves(self.ends, left),
+            _line_curves(left, right),
+            _line_curves(right, self.ends),
+        ], axis=1)
+        # The shaft's end (tip base) never coincides with the tip's first
+        # point (the apex), so every shaft and tip is its own subpath and
+        # only the closed tips are filled
+        self.set_points(curves.reshape(-1, 3))
+
+    def grow(self, **kwargs):
+        return GrowArrowBundle(self, **kwargs)
+
+
+class GrowArrowBundle(Animation):
+    """Grow every arrow of an ArrowBundle out of its start point"""
+
+    def __init__(self, bundle, **kwargs):
+        super().__init__(bundle, introducer=True, **kwargs)
+
+    def interpolate_mobject(self, alpha):
+        alpha = self.rate_func(alpha)
+        points = self.starting_mobject.points.reshape(-1, ArrowBundle.POINTS_PER_ARROW, 3)
+        starts = self.starting_mobject.starts[:, np.newaxis, :]
+        self.mobject.points = (starts + (points - starts) * alpha).reshape(-1, 3)
@@ -0,0 +1,199 @@
+"""Self-attention over TransformerWorkflow's embeddings, one head at a time
+
+All numbers come from TransformerData.attention, which computes Q, K, V, the
+scaled scores, their softmax and the outputs of every head in one batched
+NumPy pass. Every product is drawn as heatmaps and revealed as a whole or one
+tile_size × tile_size block per play (like a blocked matrix product) instead
+of entry by entry. The heads are independent, so they can be rendered in
+parallel worker processes and joined afterwards:
+
+    python attention.py -q l -j 4 -o media/attention.mp4
+"""
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import *
+import numpy as np
+
+from heatmap import MatrixHeatmap
+from highlights import HighlightPool
+from layout import fit_below
+from reveal_order import reveal_tiles
+from tex_precompile import precompile_tex
+from transformer import TransformerWorkflow
+from workflow_data import TransformerData
+
+
+class AttentionScene(Scene):
+    sentence = TransformerWorkflow.sentence
+    vocab_dict = TransformerWorkflow.vocab_dict
+    embedding_dim = 8
+    num_heads = 2
+    seed = 0
+    # Heads played by construct (None for all of them); render_heads renders
+    # one head per worker and only shows the title before the first
+    heads = None
+    show_intro = True
+    # "whole" reveals each product in one play, "tiled" one block per play
+    reveal_mode = "tiled"
+    tile_size = 4
+
+    def setup(self):
+        precompile_tex([r"\times", "="])
+        self.data = TransformerData.build(
+            self.sentence, self.vocab_dict, seed=self.seed, embedding_dim=self.embedding_dim
+        )
+        self.attention = self.data.attention(self.num_heads)
+
+    def construct(self):
+        if self.show_intro:
+            self.show_title()
+        heads = range(self.num_heads) if self.heads is None else self.heads
+        for head in heads:
+            self.play_head(head)
+
+    def show_title(self):
+        title = Text("Multi-Head Self-Attention", font_size=36, color=BLUE)
+        self.play(Write(title))
+        self.play(FadeOut(title))
+
+    def play_head(self, head):
+        """Project the embeddings for one head, score, normalize and mix the values"""
+        attention = self.attention
+        head_dim = attention["Q"].shape[-1]
+        columns = slice(head * head_dim, (head + 1) * head_dim)
+        x = self.data.embeddings
+        weights = self.data.weights
+
+        head_title = Text(f"Head {head + 1} of {self.num_heads}", font_size=28, color=GREEN)
+        head_title.to_edge(UP)
+        self.play(Write(head_title))
+        self.play_product("Q = X W_q", x, weights["W_q"][:, columns], attention["Q"][head], head_title)
+        self.play_product("K = X W_k", x, weights["W_k"][:, columns], attention["K"][head], head_title)
+        self.play_product("V = X W_v", x, weights["W_v"][:, columns], attention["V"][head], head_title)
+        self.play_product("S = Q Kᵀ / √d", attention["Q"][head] / np.sqrt(head_dim),
+                          attention["K"][head].T, attention["scores"][head], head_title)
+        self.play_softmax(attention["scores"][head], attention["weights"][head], head_title)
+        self.play_product("Output = A V", attention["weights"][head], attention["V"][head],
+                          attention["output"][head], head_title)
+        self.play(FadeOut(head_title))
+
+    def get_tiles(self, shape):
+        """Return the ((row_start, row_end), (col_start, col_end)) blocks revealed per play"""
+        return reveal_tiles(shape, self.reveal_mode, self.tile_size)
+
+    def play_product(self, label, left, right, result, title):
+        """Show left × right = result and reveal the result block by block"""
+        left_map = MatrixHeatmap(left, colormap=[BLUE_E, BLACK, RED_E])
+        right_map = MatrixHeatmap(right, colormap=[BLUE_E, BLACK, RED_E])
+        result_map = MatrixHeatmap(result, revealed=False)
+        result_frame = SurroundingRectangle(result_map, color=GREEN, buff=0.05)
+        equation = Group(left_map, MathTex(r"\times"), right_map, MathTex("="),
+                         Group(result_map, result_frame))
+        equation.arrange(RIGHT, buff=0.3)
+        fit_below(equation, title, buff=0.8)
+        name = Text(label, font_size=22, color=YELLOW).next_to(equation, UP, buff=0.25)
+
+        self.play(FadeIn(left_map), FadeIn(right_map), Write(equation[1]), Write(equation[3]),
+                  Create(result_frame), Write(name))
+        self.add(result_map)
+
+        inner_dim = left_map.shape[1]
+        highlights = HighlightPool()
+        for rows, cols in self.get_tiles(result_map.shape):
+            self.play(
+                highlights.rectangle("rows", *left_map.get_block_bounds(rows, (0, inner_dim - 1)),
+                                     color=YELLOW),
+                highlights.rectangle("cols", *right_map.get_block_bounds((0, inner_dim - 1), cols),
+                                     color=YELLOW),
+                result_map.reveal(np.s_[rows[0]:rows[1] + 1, cols[0]:cols[1] + 1]),
+                run_time=0.6
+            )
+        self.play(*highlights.release(), run_time=0.4)
+        self.wait(0.5)
+        self.play(FadeOut(equation), FadeOut(name))
+
+    def play_softmax(self, scores, weights, title):
+        """Normalize the scores row by row into attention weights"""
+        scores_map = MatrixHeatmap(scores)
+        weights_map = MatrixHeatmap(weights, colormap=[BLACK, YELLOW], vmin=0, vmax=1,
+                                    revealed=False)
+        weights_frame = SurroundingRectangle(weights_map, color=YELLOW, buff=0.05)
+        arrow = Arrow(LEFT, RIGHT, color=WHITE)
+        group = Group(scores_map, arrow, Group(weights_map, weights_frame)).arrange(RIGHT, buff=0.4)
+        fit_below(group, title, buff=0.8)
+        name = Text("A = softmax(S), row by row", font_size=22, color=YELLOW)
+        name.next_to(group, UP, buff=0.25)
+
+        self.play(FadeIn(scores_map), GrowArrow(arrow), Create(weights_frame), Write(name))
+        self.add(weights_map)
+        n_rows, n_cols = scores_map.shape
+        highlights = HighlightPool()
+        row_tiles = self.get_tiles((n_rows, 1))
+        for rows, _ in row_tiles:
+            self.play(
+                highlights.rectangle("rows", *scores_map.get_block_bounds(rows, (0, n_cols - 1)),
+                                     color=YELLOW),
+                weights_map.reveal(np.s_[rows[0]:rows[1] + 1, :]),
+                run_time=0.6
+            )
+        self.play(*highlights.release(), run_time=0.4)
+        self.wait(0.5)
+        self.play(FadeOut(group), FadeOut(name))
+
+
+def make_head_scene(scene_class, head, num_heads):
+    """Return a scene class that plays a single head"""
+    return type(f"{scene_class.__name__}_head{head}", (scene_class,),
+                {"heads": [head], "num_heads": num_heads, "show_intro": head == 0})
+
+
+def _render_head_job(scene_class, head, num_heads, render_settings, media_dir):
+    # Runs in a worker process; every head gets its own media dir so the
+    # workers never write the same tex or partial movie files
+    with tempconfig({**render_settings, "media_dir": media_dir, "output_file": f"head{head}"}):
+        scene = make_head_scene(scene_class, head, num_heads)()
+        scene.render()
+        return Path(scene.renderer.file_writer.movie_file_path)
+
+
+def render_heads(output, scene_class=AttentionScene, num_heads=None, jobs=None):
+    """Render every head in its own worker process and join them into output"""
+    from segments import concat_segments
+
+    num_heads = num_heads or scene_class.num_heads
+    render_settings = {
+        "pixel_width": config.pixel_width,
+        "pixel_height": config.pixel_height,
+        "frame_rate": config.frame_rate,
+    }
+    with tempfile.TemporaryDirectory() as work_dir:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                pool.submit(_render_head_job, scene_class, head, num_heads, render_settings,
+                            str(Path(work_dir) / f"head{head}"))
+                for head in range(num_heads)
+            ]
+            movies = [future.result() for future in futures]
+        return concat_segments(movies, output)
+
+
+def main():
+    from scenes import QUALITIES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default="media/AttentionScene.mp4")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("--heads", type=int, default=AttentionScene.num_heads)
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="render heads in this many worker processes")
+    args = parser.parse_args()
+
+    with tempconfig({"quality": QUALITIES[args.quality]}):
+        print(render_heads(args.output, num_heads=args.heads, jobs=args.jobs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Rasterize static scene content once and reuse it across plays
+
+For every play the Cairo renderer draws the mobjects that don't move into a
+static image and then, each frame, draws the moving ones on top of it. It
+redraws that static image from scratch on every play though, and everything
+added after the first moving mobject counts as moving, so a scene that keeps
+its earlier content on screen pays for all of it again and again.
+
+BackgroundCacheScene adds a background layer below the per-play static
+image. freeze() declares mobjects that stay put for a span of plays: the
+layer is every static mobject up to the last frozen one in z-order (the whole
+static set when nothing is frozen), and the static mobjects above it are
+drawn over it once per play, so the z-order is the same as without the
+cache. Which mobjects move is still decided by manim. The layer is keyed on a
+fingerprint of the points, style and pixel data of its mobjects and all of
+their submobjects, so it is rasterized again as soon as any of them changes,
+whether through an animation or not.
+"""
+import hashlib
+
+import numpy as np
+
+
+def fingerprint(mobjects):
+    """Digest of the drawable state (arrays and scalar attributes) of mobjects and their families"""
+    digest = hashlib.blake2b(digest_size=16)
+    for mobject in (member for mobject in mobjects for member in mobject.get_family()):
+        digest.update(id(mobject).to_bytes(8, "little"))
+        for name, value in sorted(vars(mobject).items()):
+            if isinstance(value, np.ndarray):
+                digest.update(name.encode())
+                digest.update(value.tobytes())
+            elif isinstance(value, (int, float, str, bool)):
+                digest.update(f"{name}={value!r}".encode())
+    return digest.digest()
+
+
+class BackgroundCacheScene:
+    """Mixin caching the rasterized background layer between plays"""
+
+    def setup(self):
+        super().setup()
+        self.frozen = set()
+        self.background_stats = {"hits": 0, "misses": 0}
+        self._background_key = None
+        self._background_image = None
+        renderer = self.renderer
+        # Only the Cairo renderer draws a static image per play
+        if hasattr(renderer, "save_static_frame_data"):
+            self._save_static_frame_data = renderer.save_static_frame_data
+            renderer.save_static_frame_data = self.save_static_frame_data
+
+    def freeze(self, *mobjects):
+        """Declare mobjects stable across plays, so the layer reaches up to them"""
+        for mobject in mobjects:
+            self.frozen.update(mobject.get_family())
+
+    def unfreeze(self, *mobjects):
+        for mobject in mobjects:
+            self.frozen.difference_update(mobject.get_family())
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        renderer = self.renderer
+        static_mobjects = list(static_mobjects)
+        frozen_at = [i for i, m in enumerate(static_mobjects) if m in self.frozen]
+        layer = static_mobjects[:frozen_at[-1] + 1] if frozen_at else static_mobjects
+        if not layer:
+            return self._save_static_frame_data(scene, static_mobjects)
+
+        key = (renderer.camera.pixel_array.shape, fingerprint(layer))
+        if key == self._background_key:
+            self.background_stats["hits"] += 1
+        else:
+            self.background_stats["misses"] += 1
+            self._background_image = self._save_static_frame_data(scene, layer)
+            self._background_key = key
+
+        # The static mobjects above the layer are drawn over it once per play
+        renderer.static_image = self._background_image
+        rest = static_mobjects[len(layer):]
+        if rest:
+            renderer.update_frame(scene, mobjects=rest)
+            renderer.static_image = renderer.get_frame()
+        return renderer.static_image
@@ -0,0 +1,176 @@
+"""Render many TransformerWorkflow and MatrixMultiplicationAnimation jobs from a JSONL file
+
+Each line of the jobs file is one video, e.g.
+
+    {"id": "cat", "scene": "transformer", "sentence": "The cat sits", "vocab_path": "vocab.txt"}
+    {"id": "m3", "scene": "matrix", "matrix1": [[1, 2], [3, 4]], "matrix2": [[5, 6], [7, 8]], "quality": "m"}
+
+Besides the keys above a job may set "output" (defaults to <output-dir>/<id>.mp4),
+"vocab" (a token -> ID dict), "merges_path" and "params", a dict of any other
+scene class attributes. Jobs run on a pool of long-lived worker processes that
+import manim once and keep their own tex and text caches (manim writes those
+files in place, so workers sharing them would race), so only the first job in
+a worker pays for the imports and font setup. Every movie is moved into place
+atomically and a per-job timing summary is written at the end:
+
+    python batch.py jobs.jsonl -j 4 -o media/batch -s summary.json
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from scenes import QUALITIES
+
+# Job keys that map straight onto scene class attributes
+JOB_ATTRIBUTES = {
+    "transformer": {"sentence": "sentence", "vocab": "vocab_dict",
+                    "vocab_path": "vocab_path", "merges_path": "merges_path"},
+    "matrix": {"matrix1": "matrix1_vals", "matrix2": "matrix2_vals"},
+}
+
+
+def _warm_worker(media_dir):
+    """Pool initializer: import manim and the scenes once per worker process"""
+    import manim
+    import matric_multiplication  # noqa: F401
+    import transformer  # noqa: F401
+
+    # Tex and text SVGs are cached on disk by content but not written
+    # atomically, so each worker caches into a directory of its own
+    manim.config.media_dir = str(Path(media_dir) / f"worker-{os.getpid()}")
+    # Building one Text loads the fonts before the first job is timed
+    manim.Text("warm")
+
+
+def build_scene_class(job, mixins=()):
+    """Create the scene class for a job (done in the worker, classes don't pickle)"""
+    from matric_multiplication import MatrixMultiplicationAnimation
+    from transformer import TransformerWorkflow
+
+    base = {"transformer": TransformerWorkflow, "matrix": MatrixMultiplicationAnimation}[job["scene"]]
+    attrs = {
+        attribute: job[key]
+        for key, attribute in JOB_ATTRIBUTES[job["scene"]].items()
+        if key in job
+    }
+    attrs.update(job.get("params", {}))
+    return type(f"{base.__name__}_{job['id']}", (*mixins, base), attrs)
+
+
+def run_job(job):
+    """Render one job into its output file and return its timings"""
+    from manim import tempconfig
+
+    start = time.perf_counter()
+    output = Path(job["output"])
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Movies and partial movies are private to the job, the tex/text caches are not
+    with tempfile.TemporaryDirectory() as video_dir:
+        settings = {
+            "quality": QUALITIES[job.get("quality", "l")],
+            "video_dir": video_dir,
+            "output_file": output.stem,
+        }
+        with tempconfig(settings):
+            scene = build_scene_class(job)()
+            setup_time = time.perf_counter() - start
+            scene.render()
+            movie = Path(scene.renderer.file_writer.movie_file_path)
+            render_time = time.perf_counter() - start - setup_time
+
+        # Copy next to the target, then rename, so output is never half written
+        tmp_output = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        shutil.copyfile(movie, tmp_output)
+        os.replace(tmp_output, output)
+
+    return {
+        "setup_time": setup_time,
+        "render_time": render_time,
+        "wall_time": time.perf_counter() - start,
+        "worker": os.getpid(),
+    }
+
+
+def read_jobs(path, output_dir):
+    jobs = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            job.setdefault("id", f"job{line_number}")
+            job.setdefault("scene", "transformer")
+            if job["scene"] not in JOB_ATTRIBUTES:
+                raise ValueError(f"line {line_number}: unknown scene {job['scene']!r}")
+            if job.get("quality", "l") not in QUALITIES:
+                raise ValueError(f"line {line_number}: unknown quality {job['quality']!r}")
+            job.setdefault("output", str(Path(output_dir) / f"{job['id']}.mp4"))
+            jobs.append(job)
+    return jobs
+
+
+def run_batch(jobs, workers=1, media_dir=Path("media")):
+    """Render jobs on a warm worker pool and return one summary entry per job"""
+    summary = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker,
+                             initargs=(media_dir,)) as pool:
+        futures = {pool.submit(run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            entry = {"id": job["id"], "scene": job["scene"], "output": job["output"]}
+            try:
+                entry.update(status="ok", **future.result())
+                print(f"{job['id']}: {entry['wall_time']:.2f}s -> {job['output']}")
+            except Exception as error:
+                entry.update(status="failed", error=f"{type(error).__name__}: {error}")
+                print(f"{job['id']}: failed ({entry['error']})")
+            summary[job["id"]] = entry
+    # Report in the order of the jobs file
+    return [summary[job["id"]] for job in jobs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("jobs", help="JSONL file with one job per line")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("-o", "--output-dir", default="media/batch")
+    parser.add_argument("--media-dir", default="media",
+                        help="media directory holding each worker's tex and text caches")
+    parser.add_argument("-s", "--summary", default=None, help="write the timing summary as JSON")
+    args = parser.parse_args()
+
+    # Check the jobs against the scene registry before paying for any manim import
+    from scenes import discover, validate_jobs
+
+    problems = validate_jobs(args.jobs, discover())
+    if problems:
+        parser.error("\n".join(problems))
+    jobs = read_jobs(args.jobs, args.output_dir)
+    ids = [job["id"] for job in jobs]
+    if len(set(ids)) != len(ids):
+        parser.error("job ids must be unique")
+
+    start = time.perf_counter()
+    summary = run_batch(jobs, args.workers, Path(args.media_dir).resolve())
+    total = time.perf_counter() - start
+
+    print(f"\n{'job':<20} {'status':<8} {'setup':>8} {'render':>8} {'wall':>8}")
+    for entry in summary:
+        times = [f"{entry[key]:8.2f}" if key in entry else f"{'-':>8}"
+                 for key in ("setup_time", "render_time", "wall_time")]
+        print(f"{entry['id']:<20} {entry['status']:<8} {' '.join(times)}")
+    failed = sum(entry["status"] != "ok" for entry in summary)
+    print(f"{len(summary) - failed}/{len(summary)} jobs in {total:.2f}s")
+
+    if args.summary:
+        report = {"total_time": total, "workers": args.workers, "jobs": summary}
+        Path(args.summary).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Benchmark TransformerWorkflow and MatrixMultiplicationAnimation at parameterized sizes
+
+Every case runs in a fresh worker process, so peak RSS is per case. Each
+TransformerWorkflow size is measured as a whole scene and step by step (the
+steps' entry states are planned in a process of their own), and every case
+runs with animations skipped and as a low quality render. Results
+are written as JSON so runs can be compared between commits:
+
+    python bench.py --sentence-lengths 4 16 64 --vocab-sizes 9 50000 \\
+        --embedding-dims 4 768 --matrix-sizes 3 16 32 -o bench.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from scenes import QUALITIES
+
+MODES = {
+    "skip": {"skip_animations": True, "write_to_movie": False},
+    "render": {"quality": QUALITIES["l"], "disable_caching": True},
+}
+
+
+class MeasuredScene:
+    """Mixin counting plays and waits and tracking the peak mobject count"""
+
+    def setup(self):
+        super().setup()
+        self.bench_stats = {"plays": 0, "waits": 0, "peak_mobjects": 0}
+
+    def play(self, *args, **kwargs):
+        super().play(*args, **kwargs)
+        self.bench_stats["plays"] += 1
+        self.sample_mobjects()
+
+    def wait(self, *args, **kwargs):
+        super().wait(*args, **kwargs)
+        self.bench_stats["waits"] += 1
+        self.sample_mobjects()
+
+    def sample_mobjects(self):
+        count = len(self.get_mobject_family_members())
+        self.bench_stats["peak_mobjects"] = max(self.bench_stats["peak_mobjects"], count)
+
+
+def synthetic_vocab(vocab_size):
+    return {f"w{i}": i for i in range(vocab_size)}
+
+
+def synthetic_sentence(sentence_length, vocab_size):
+    # Spread the words over the vocabulary deterministically
+    return " ".join(f"w{(i * 7919) % vocab_size}" for i in range(sentence_length))
+
+
+def bench_job(case):
+    """Describe a case as a batch.py job, so the scene class is built the same way"""
+    params = case["params"]
+    if case["scene"] == "MatrixMultiplicationAnimation":
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        n = params["matrix_n"]
+        return {
+            "id": "bench",
+            "scene": "matrix",
+            "matrix1": rng.integers(0, 10, size=(n, n)),
+            "matrix2": rng.integers(0, 10, size=(n, n)),
+            "params": {"reveal_mode": params["reveal_mode"]},
+        }
+    return {
+        "id": "bench",
+        "scene": "transformer",
+        "sentence": synthetic_sentence(params["sentence_length"], params["vocab_size"]),
+        "vocab": synthetic_vocab(params["vocab_size"]),
+        "params": {"embedding_dim": params["embedding_dim"]},
+    }
+
+
+def build_scene_class(case):
+    """Create the measured scene class for a case (done in the worker, classes don't pickle)"""
+    import batch
+
+    return batch.build_scene_class(bench_job(case), mixins=(MeasuredScene,))
+
+
+def plan_states(case):
+    """Return the entry state of every step of a case's scene, keyed by step"""
+    from manim import tempconfig
+    import segments
+
+    scene_class = build_scene_class(case)
+    with tempfile.TemporaryDirectory() as media_dir, tempconfig({"media_dir": media_dir}):
+        entry_states = segments.plan_entry_states(scene_class)
+    return dict(zip(scene_class.steps, entry_states))
+
+
+def run_case(case):
+    """Render one case and return its measurements"""
+    from manim import config, tempconfig
+    import segments
+    from text_cache import TEXT_CACHE
+
+    scene_class = build_scene_class(case)
+    with tempfile.TemporaryDirectory() as media_dir:
+        if case["step"] is not None:
+            scene_class = segments.make_segment_scene(scene_class, case["step"], case["entry_state"])
+
+        with tempconfig({"media_dir": media_dir, **MODES[case["mode"]]}):
+            start = time.perf_counter()
+            scene = scene_class()
+            scene.render()
+            wall_time = time.perf_counter() - start
+            frames = round(scene.renderer.time * config.frame_rate) if case["mode"] == "render" else 0
+
+    case = {k: v for k, v in case.items() if k != "entry_state"}
+    return {
+        **case,
+        **scene.bench_stats,
+        "wall_time": wall_time,
+        "frames": frames,
+        "time_per_frame": wall_time / frames if frames else None,
+        "text_cache": TEXT_CACHE.stats(),
+        "background_cache": getattr(scene, "background_stats", None),
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def build_cases(args):
+    cases = []
+    for mode in args.modes:
+        for length, vocab_size, dim in itertools.product(
+            args.sentence_lengths, args.vocab_sizes, args.embedding_dims
+        ):
+            params = {"sentence_length": length, "vocab_size": vocab_size, "embedding_dim": dim}
+            steps = [None] if args.no_steps else [None, *_transformer_steps()]
+            for step in steps:
+                cases.append({"scene": "TransformerWorkflow", "step": step,
+                              "params": params, "mode": mode})
+        for n in args.matrix_sizes:
+            params = {"matrix_n": n, "reveal_mode": args.matrix_reveal_mode}
+            cases.append({"scene": "MatrixMultiplicationAnimation", "step": None,
+                          "params": params, "mode": mode})
+    return cases
+
+
+def _transformer_steps():
+    from transformer import TransformerWorkflow
+
+    return list(TransformerWorkflow.steps)
+
+
+def git_commit():
+    result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentence-lengths", type=int, nargs="+", default=[6])
+    parser.add_argument("--vocab-sizes", type=int, nargs="+", default=[9])
+    parser.add_argument("--embedding-dims", type=int, nargs="+", default=[4])
+    parser.add_argument("--matrix-sizes", type=int, nargs="+", default=[3])
+    parser.add_argument("--matrix-reveal-mode", default="cell")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--no-steps", action="store_true",
+                        help="only measure whole TransformerWorkflow renders")
+    parser.add_argument("-o", "--output", default="bench.json")
+    args = parser.parse_args()
+
+    cases = build_cases(args)
+    results = []
+    # One process per case (and per planning pass) so peak RSS and warm caches
+    # don't leak between cases
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        plans = {}
+        for case in cases:
+            if case["step"] is None:
+                continue
+            key = json.dumps(case["params"], sort_keys=True)
+            if key not in plans:
+                plans[key] = pool.submit(plan_states, case).result()
+            case["entry_state"] = plans[key][case["step"]]
+        for result in pool.map(run_case, cases):
+            step = f".{result['step']}" if result["step"] else ""
+            print(f"{result['scene']}{step} {result['params']} [{result['mode']}]: "
+                  f"{result['wall_time']:.2f}s, {result['plays']} plays")
+            results.append(result)
+
+    report = {
+        "commit": git_commit(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Run a scene's construct without rasterizing and write its timeline
+
+Every play runs its animations straight to their final state and every wait
+only advances the clock, so no frame is drawn or encoded. The timeline lists
+each call with its start time, duration, calling step and the final bounding
+boxes of the mobjects it animated, and warns about mobjects that end up off
+frame or overlapping one another (lines and arrows are only checked against
+the frame, since fanned-out arrows overlap as boxes without touching):
+
+    python dry_run.py transformer.py TransformerWorkflow -o timeline.json
+"""
+import argparse
+import importlib
+import json
+import time
+from pathlib import Path
+
+from manim import DL, UR, Line, config, logger, tempconfig
+
+from arrow_bundle import ArrowBundle
+
+from profiling import calling_step
+
+# Slack for off-frame and overlap checks, in scene units
+TOLERANCE = 1e-3
+# Line-like mobjects (Arrow included) whose bounding boxes say little about overlap
+LINE_TYPES = (Line, ArrowBundle)
+
+
+def _animated_mobjects(animation):
+    """The mobjects an animation (or nested animation group) animates"""
+    if hasattr(animation, "animations"):
+        mobjects = []
+        for sub_animation in animation.animations:
+            mobjects += _animated_mobjects(sub_animation)
+        return mobjects
+    return [animation.mobject] if animation.mobject is not None else []
+
+
+def _bounding_box(mobject):
+    if mobject.width == 0 and mobject.height == 0:
+        return None
+    (x_min, y_min, _), (x_max, y_max, _) = mobject.get_corner(DL), mobject.get_corner(UR)
+    return [round(float(v), 4) for v in (x_min, y_min, x_max, y_max)]
+
+
+def _overlaps(a, b):
+    """True if boxes a and b overlap without one containing the other"""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= TOLERANCE or height <= TOLERANCE:
+        return False
+    contains = lambda outer, inner: (outer[0] <= inner[0] and outer[1] <= inner[1]
+                                     and outer[2] >= inner[2] and outer[3] >= inner[3])
+    return not contains(a, b) and not contains(b, a)
+
+
+class DryRunScene:
+    """Mixin replacing play and wait with bookkeeping only"""
+
+    def setup(self):
+        super().setup()
+        self.timeline = []
+        self.layout_warnings = []
+        self.timeline_time = 0.0
+
+    def play(self, *args, **kwargs):
+        animations = self.compile_animations(*args, **kwargs)
+        self.add_mobjects_from_animations(animations)
+        for animation in animations:
+            animation._setup_scene(self)
+            animation.begin()
+        for animation in animations:
+            animation.finish()
+            animation.clean_up_from_scene(self)
+        mobjects = [m for animation in animations for m in _animated_mobjects(animation)]
+        self._record("play", self.get_run_time(animations), mobjects)
+
+    def wait(self, duration=1.0, *args, **kwargs):
+        self._record("wait", duration, [])
+
+    def _record(self, kind, duration, mobjects):
+        on_screen = set(self.get_mobject_family_members())
+        entries = []
+        for mobject in dict.fromkeys(mobjects):
+            box = _bounding_box(mobject)
+            if box is None:
+                continue
+            entries.append((mobject, box))
+
+        index = len(self.timeline)
+        step = calling_step(self)
+        self.timeline.append({
+            "index": index,
+            "kind": kind,
+            "step": step,
+            "start": round(self.timeline_time, 4),
+            "duration": duration,
+            "mobjects": [
+                {"type": type(mobject).__name__, "bbox": box, "on_screen": mobject in on_screen}
+                for mobject, box in entries
+            ],
+        })
+        self.timeline_time += duration
+        self._check_layout(index, step, [(m, box) for m, box in entries if m in on_screen])
+
+    def _check_layout(self, index, step, entries):
+        half_width, half_height = config.frame_width / 2, config.frame_height / 2
+        for mobject, box in entries:
+            if (box[0] < -half_width - TOLERANCE or box[2] > half_width + TOLERANCE
+                    or box[1] < -half_height - TOLERANCE or box[3] > half_height + TOLERANCE):
+                self._warn(index, step, f"{type(mobject).__name__} off frame at {box}")
+
+        # Only compare mobjects of the same kind that are not part of each other,
+        # e.g. two token boxes, not a label and the box it sits in
+        entries = [(m, box) for m, box in entries if not isinstance(m, LINE_TYPES)]
+        for i, (a, box_a) in enumerate(entries):
+            for b, box_b in entries[i + 1:]:
+                if type(a) is not type(b) or a in b.get_family() or b in a.get_family():
+                    continue
+                if _overlaps(box_a, box_b):
+                    self._warn(index, step, f"{type(a).__name__} at {box_a} overlaps {box_b}")
+
+    def _warn(self, index, step, message):
+        self.layout_warnings.append({"index": index, "step": step, "message": message})
+        logger.warning(f"[{index} {step}] {message}")
+
+
+def dry_run(scene_class, output=None):
+    """Run scene_class's construct without rendering and return its timeline"""
+    dry_class = type(f"DryRun{scene_class.__name__}", (DryRunScene, scene_class), {})
+    start = time.perf_counter()
+    with tempconfig({"dry_run": True}):
+        scene = dry_class()
+        scene.setup()
+        scene.construct()
+        scene.tear_down()
+    report = {
+        "scene": scene_class.__name__,
+        "duration": round(scene.timeline_time, 4),
+        "plays": sum(1 for event in scene.timeline if event["kind"] == "play"),
+        "waits": sum(1 for event in scene.timeline if event["kind"] == "wait"),
+        "elapsed": round(time.perf_counter() - start, 4),
+        "warnings": scene.layout_warnings,
+        "timeline": scene.timeline,
+    }
+    if output:
+        Path(output).write_text(json.dumps(report, indent=1))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", help="scene file, e.g. transformer.py")
+    parser.add_argument("scene", help="scene class, e.g. TransformerWorkflow")
+    parser.add_argument("-o", "--output", default="timeline.json")
+    args = parser.parse_args()
+
+    module = importlib.import_module(Path(args.module).stem)
+    report = dry_run(getattr(module, args.scene), args.output)
+    print(f"{report['plays']} plays, {report['waits']} waits, {report['duration']}s of video, "
+          f"{len(report['warnings'])} warnings in {report['elapsed']}s")
+
+
+if __name__ == "__main__":
+    main()
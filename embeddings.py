@@ -0,0 +1,29 @@
+"""Read embedding rows from a table on disk without loading the whole table
+
+A .npy table is opened with np.load(mmap_mode="r"); any other file is treated
+as a raw row-major dump (e.g. model.embed_tokens.bin) and needs its shape and
+dtype. Either way only the pages backing the requested rows are read.
+"""
+from pathlib import Path
+
+# numpy is imported inside the functions so that importing this module (e.g.
+# to validate jobs or list scenes) stays cheap
+
+
+def open_embedding_table(path, shape=None, dtype="float32"):
+    """Memory-map an embedding table of shape (vocab_size, embedding_dim)"""
+    import numpy as np
+
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    if shape is None:
+        raise ValueError(f"Raw embedding table {path} needs an explicit shape")
+    return np.memmap(path, dtype=dtype, mode="r", shape=tuple(shape))
+
+
+def gather_rows(table, ids):
+    """Return the rows for ids with a single fancy-index read, as an in-memory array"""
+    import numpy as np
+
+    return np.asarray(table[np.asarray(ids, dtype=np.intp)])
@@ -0,0 +1,116 @@
+"""Draw a whole matrix as one colormapped image
+
+MatrixHeatmap replaces a grid of Rectangle + Text mobjects (two per number)
+with a single ImageMobject holding one pixel per cell, so its cost does not
+depend on the matrix size. Rows, columns and blocks are highlighted with a
+single rectangle each, and value labels are only built for the cells asked for.
+"""
+from manim import *
+import numpy as np
+
+from text_cache import cached_text
+
+DEFAULT_COLORMAP = [BLUE_E, BLACK, RED_E]
+
+
+class MatrixHeatmap(Group):
+    def __init__(self, values, width=None, height=None, cell_size=0.4,
+                 colormap=DEFAULT_COLORMAP, vmin=None, vmax=None, revealed=True, **kwargs):
+        super().__init__(**kwargs)
+        self.values = np.asarray(values, dtype=float)
+        if self.values.ndim == 1:
+            self.values = self.values[np.newaxis, :]
+        n_rows, n_cols = self.values.shape
+        limit = np.abs(self.values).max() or 1
+        self.vmin = -limit if vmin is None else vmin
+        self.vmax = limit if vmax is None else vmax
+        self.colormap = np.array([ManimColor(color).to_rgb() for color in colormap])
+        # Per-cell opacity, animated by reveal()
+        self.alpha = np.full(self.values.shape, 1.0 if revealed else 0.0)
+
+        self.image = ImageMobject(self.get_pixel_array())
+        self.image.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        self.image.stretch_to_fit_width(width or n_cols * cell_size)
+        self.image.stretch_to_fit_height(height or n_rows * cell_size)
+        self.add(self.image)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def get_pixel_array(self):
+        """Map values through the colormap into an RGBA array, one pixel per cell"""
+        span = (self.vmax - self.vmin) or 1
+        t = np.clip((self.values - self.vmin) / span, 0, 1)
+        stops = np.linspace(0, 1, len(self.colormap))
+        rgb = np.stack([np.interp(t, stops, self.colormap[:, k]) for k in range(3)], axis=-1)
+        rgba = np.concatenate([rgb, self.alpha[..., np.newaxis]], axis=-1)
+        return (rgba * 255).astype(np.uint8)
+
+    def set_values(self, values):
+        self.values = np.asarray(values, dtype=float).reshape(self.values.shape)
+        self.image.pixel_array = self.get_pixel_array()
+        return self
+
+    def get_cell_size(self):
+        n_rows, n_cols = self.shape
+        return self.image.width / n_cols, self.image.height / n_rows
+
+    def get_cell_center(self, i, j):
+        cell_width, cell_height = self.get_cell_size()
+        return (self.image.get_corner(UL)
+                + RIGHT * (j + 0.5) * cell_width
+                + DOWN * (i + 0.5) * cell_height)
+
+    def get_block_bounds(self, rows, cols, buff=0.05):
+        """Return (width, height, center) of the cells in the row and column ranges (inclusive)"""
+        cell_width, cell_height = self.get_cell_size()
+        (row_start, row_end), (col_start, col_end) = rows, cols
+        top_left = self.get_cell_center(row_start, col_start)
+        bottom_right = self.get_cell_center(row_end, col_end)
+        return (
+            (col_end - col_start + 1) * cell_width + 2 * buff,
+            (row_end - row_start + 1) * cell_height + 2 * buff,
+            (top_left + bottom_right) / 2,
+        )
+
+    def get_block_rectangle(self, rows, cols, color=YELLOW, buff=0.05, **kwargs):
+        """Return a rectangle around the cells in the row and column ranges (inclusive)"""
+        width, height, center = self.get_block_bounds(rows, cols, buff)
+        return Rectangle(width=width, height=height, color=color, **kwargs).move_to(center)
+
+    def highlight_row(self, i, **kwargs):
+        return self.get_block_rectangle((i, i), (0, self.shape[1] - 1), **kwargs)
+
+    def highlight_column(self, j, **kwargs):
+        return self.get_block_rectangle((0, self.shape[0] - 1), (j, j), **kwargs)
+
+    def highlight_cell(self, i, j, **kwargs):
+        return self.get_block_rectangle((i, i), (j, j), **kwargs)
+
+    def get_value_labels(self, cells, num_decimal_places=2, color=WHITE):
+        """Return Text labels for the given (i, j) cells only"""
+        cell_width, cell_height = self.get_cell_size()
+        labels = VGroup()
+        for i, j in cells:
+            value = round(float(self.values[i, j]), num_decimal_places)
+            if num_decimal_places == 0:
+                value = int(value)
+            label = cached_text(str(value), font_size=24, color=color)
+            label.scale_to_fit_height(min(cell_height * 0.5, label.height))
+            if label.width > cell_width * 0.9:
+                label.scale_to_fit_width(cell_width * 0.9)
+            labels.add(label.move_to(self.get_cell_center(i, j)))
+        return labels
+
+    def reveal(self, cells=np.s_[:, :], **kwargs):
+        """Return an animation fading in the cells selected by a NumPy index"""
+        start = self.alpha.copy()
+        target = start.copy()
+        target[cells] = 1.0
+
+        def update(image, alpha):
+            self.alpha = start + (target - start) * alpha
+            image.pixel_array = self.get_pixel_array()
+
+        return UpdateFromAlphaFunc(self.image, update, **kwargs)
@@ -0,0 +1,206 @@
+"""Reuse one set of highlight rectangles and arrows across a loop
+
+The per-element loops draw a fresh SurroundingRectangle or Arrow for every
+element and fade it out again, so the number of mobjects created grows with
+the matrix size or sentence length. With reuse on, HighlightPool keeps one
+mobject per name instead: the first move creates it, and later moves and
+hide() only record where it starts and ends (size and center of a rectangle,
+start and end of an arrow, and an opacity level) as plain arrays and rewrite
+its points in place from a Reshape animation, so no mobject is built or
+copied per element. hide() fades it out without removing it from the scene,
+so the next move fades it back in at its new place. With reuse off the pool
+plays the original Create/FadeOut pairs, so a loop written against it renders
+the same either way.
+"""
+from manim import *
+import numpy as np
+
+
+class Reshape(UpdateFromAlphaFunc):
+    """UpdateFromAlphaFunc that never copies its mobject
+
+    Animation.begin() keeps a copy of the mobject as its starting state;
+    Reshape's update function carries its own start, so the copy is skipped.
+    """
+
+    def create_starting_mobject(self):
+        return self.mobject
+
+
+class RectangleShape:
+    """Sets a (rounded) rectangle to a size and center by moving its points in place
+
+    Each point moves with the corner of its quadrant, so rounded corners keep
+    their radius instead of being stretched.
+    """
+
+    def __init__(self, rectangle):
+        center = rectangle.get_center()
+        self.offsets = rectangle.points - center
+        self.signs = np.sign(self.offsets)
+        self.size = np.array([rectangle.width, rectangle.height, 0])
+        self.geometry = np.array([self.size, center])
+
+    def apply(self, rectangle, geometry):
+        size, center = geometry
+        rectangle.points[:] = self.offsets + self.signs * (size - self.size) / 2 + center
+
+
+class ArrowShape:
+    """Puts an arrow's shaft and tip on a start and end by moving their points in place
+
+    The tip keeps its shape and only turns and moves with the end; the shaft
+    fills the rest of the way.
+    """
+
+    def __init__(self, arrow, start, end):
+        along, across = _frame(start, end)
+        shaft_end = arrow.points[-1]
+        self.tip_length = np.dot(end - shaft_end, along)
+        self.shaft = (arrow.points - start) @ along / np.dot(shaft_end - start, along)
+        offsets = arrow.tip.points - end
+        self.tip = np.stack([offsets @ along, offsets @ across], axis=1)
+        self.geometry = np.array([start, end])
+
+    def apply(self, arrow, geometry):
+        start, end = geometry
+        along, across = _frame(start, end)
+        shaft_length = np.linalg.norm(end - start) - self.tip_length
+        arrow.points[:] = start + np.outer(self.shaft * shaft_length, along)
+        arrow.tip.points[:] = end + np.outer(self.tip[:, 0], along) + np.outer(self.tip[:, 1], across)
+
+
+class PooledHighlight:
+    """A pooled mobject, its shape, its current geometry and opacity level"""
+
+    def __init__(self, mobject, shape):
+        self.mobject = mobject
+        self.shape = shape
+        self.geometry = shape.geometry
+        self.level = 1
+        # Opacities at full level, scaled down by hide()
+        self.opacities = [
+            (member, member.get_fill_opacity(), member.get_stroke_opacity())
+            for member in mobject.get_family()
+        ]
+
+    def tween(self, geometry=None, level=1, **kwargs):
+        """Return a Reshape from wherever this highlight is when it starts to geometry and level
+
+        The start is only taken once the animation's alpha leaves 0, and a
+        finished one stops touching the mobject: AnimationGroup begins every
+        child at once and keeps interpolating finished ones at alpha 1, which
+        would make two timelines moving the same highlight fight over it.
+        """
+        start = None
+        done = False
+
+        def update(_, alpha):
+            nonlocal start, done
+            if done or alpha <= 0:
+                return
+            if start is None:
+                start = (self.geometry, self.level)
+            start_geometry, start_level = start
+            if geometry is not None:
+                self.geometry = start_geometry + alpha * (geometry - start_geometry)
+                self.shape.apply(self.mobject, self.geometry)
+            self.set_level(start_level + alpha * (level - start_level))
+            done = alpha >= 1
+
+        return Reshape(self.mobject, update, **kwargs)
+
+    def set_level(self, level):
+        self.level = level
+        for member, fill_opacity, stroke_opacity in self.opacities:
+            member.set_fill(opacity=fill_opacity * level, family=False)
+            member.set_stroke(opacity=stroke_opacity * level, family=False)
+
+
+class HighlightPool:
+    def __init__(self, reuse=True):
+        self.reuse = reuse
+        self.mobjects = {}
+        self.highlights = {}
+
+    def move(self, name, make, shape, geometry, **kwargs):
+        """Return an animation bringing the named highlight to its next place
+
+        make() builds the highlight, the first time or, with reuse off, every
+        time; shape(mobject) wraps a new one in the RectangleShape or
+        ArrowShape that later moves apply geometry through.
+        """
+        highlight = self.highlights.get(name)
+        if highlight is not None and self.reuse:
+            return highlight.tween(geometry, **kwargs)
+        mobject = self.mobjects[name] = make()
+        self.highlights[name] = PooledHighlight(mobject, shape(mobject))
+        if isinstance(mobject, Arrow):
+            return GrowArrow(mobject, **kwargs)
+        return Create(mobject, **kwargs)
+
+    def surround(self, name, mobject, buff=SMALL_BUFF, run_time=None, **style):
+        """move() the named SurroundingRectangle(mobject, buff, **style) around mobject"""
+        return self.rectangle(
+            name, mobject.width + 2 * buff, mobject.height + 2 * buff, mobject.get_center(),
+            run_time=run_time, make=lambda: SurroundingRectangle(mobject, buff=buff, **style)
+        )
+
+    def rectangle(self, name, width, height, center, run_time=None, make=None, **style):
+        """move() the named width × height Rectangle(**style) (or make()) onto center"""
+        geometry = np.array([[width, height, 0], center], dtype=float)
+        return self.move(
+            name,
+            make or (lambda: Rectangle(width=width, height=height, **style).move_to(center)),
+            RectangleShape,
+            geometry,
+            **_timing(run_time)
+        )
+
+    def arrow(self, name, start, end, buff=MED_SMALL_BUFF, run_time=None, **style):
+        """move() the named Arrow(start, end, buff, **style) onto start and end"""
+        start = np.array(start, dtype=float)
+        end = np.array(end, dtype=float)
+        # Arrow pulls both of its ends in by buff
+        inset = normalize(end - start) * buff
+        return self.move(
+            name,
+            lambda: Arrow(start=start, end=end, buff=buff, **style),
+            lambda arrow: ArrowShape(arrow, start + inset, end - inset),
+            np.array([start + inset, end - inset]),
+            **_timing(run_time)
+        )
+
+    def hide(self, *names, **kwargs):
+        """Return animations fading the named highlights out"""
+        if not self.reuse:
+            return [FadeOut(self.mobjects[name], **kwargs) for name in names]
+        # Kept in the scene (invisible) so the next move can bring it back
+        return [self.highlights[name].tween(level=0, **kwargs) for name in names]
+
+    def release(self, **kwargs):
+        """Return animations removing every highlight, and forget them"""
+        animations = [FadeOut(mobject, **kwargs) for mobject in self.mobjects.values()]
+        self.mobjects = {}
+        self.highlights = {}
+        return animations
+
+    def remove_from(self, scene):
+        """Take every highlight out of scene and forget them
+
+        For the end of a loop: reused highlights are only hidden, so they are
+        still in the scene.
+        """
+        scene.remove(*self.mobjects.values())
+        self.mobjects = {}
+        self.highlights = {}
+
+
+def _frame(start, end):
+    """Unit vectors along start → end and across it, in the frame's plane"""
+    along = normalize(end - start)
+    return along, np.array([-along[1], along[0], 0])
+
+
+def _timing(run_time):
+    return {} if run_time is None else {"run_time": run_time}
@@ -0,0 +1,15 @@
+"""Fitting groups on frame under a scene's title"""
+from manim import DOWN, config
+
+
+def get_fit_scale(mobject, title, buff=0.5):
+    """Return the factor (at most 1) that shrinks mobject to fit the frame below title"""
+    max_width = config.frame_width - 1
+    max_height = config.frame_height - title.height - buff - 1
+    return min(1, max_width / mobject.width, max_height / mobject.height)
+
+
+def fit_below(mobject, title, buff=0.5):
+    """Shrink mobject if it doesn't fit the frame below title, and place it there"""
+    mobject.scale(get_fit_scale(mobject, title, buff))
+    return mobject.next_to(title, DOWN, buff=buff)
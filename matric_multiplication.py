@@ -1,22 +1,80 @@
 from manim import *
+import numpy as np
+
+from heatmap import MatrixHeatmap
+from highlights import HighlightPool
+from layout import fit_below, get_fit_scale
+from reveal_order import reveal_batches
+from tex_precompile import precompile_tex
 
 class MatrixMultiplicationAnimation(Scene):
+    # Define the two matrices (N×K and K×M)
+    matrix1_vals = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    matrix2_vals = [[9, 8, 7], [6, 5, 4], [3, 2, 1]]
+    # How the result cells are revealed: "cell" walks through every entry
+    # with its calculation, "row", "column" and "wavefront" (anti-diagonals)
+    # reveal a whole batch of cells in a single play
+    reveal_mode = "cell"
+    # Cells per play in the batched modes (None for a whole row/column/diagonal)
+    batch_size = None
+    # "matrix" draws Matrix mobjects with a tex entry per cell, "heatmap" draws
+    # each matrix as one colormapped image; "auto" switches to heatmaps once a
+    # dimension exceeds heatmap_threshold
+    render_mode = "auto"
+    heatmap_threshold = 8
+    # Heatmap batches of up to this many cells show their values while highlighted
+    label_batch_limit = 8
+    # Move one persistent row box and column box from cell to cell (or batch
+    # to batch) instead of creating and fading out new ones every time
+    reuse_highlights = False
+
+    def use_heatmap(self):
+        if self.render_mode == "auto":
+            shapes = np.shape(self.matrix1_vals) + np.shape(self.matrix2_vals)
+            return max(shapes) > self.heatmap_threshold
+        return self.render_mode == "heatmap"
+
+    def setup(self):
+        # Compile every tex string the scene needs in one LaTeX run up front
+        precompile_tex(self.collect_tex_expressions())
+
+    def collect_tex_expressions(self):
+        """Return every MathTex string construct will build"""
+        matrix1_vals = np.array(self.matrix1_vals)
+        matrix2_vals = np.array(self.matrix2_vals)
+        result_matrix_vals = matrix1_vals @ matrix2_vals
+        expressions = [r"\times", "="]
+        if self.use_heatmap():
+            return expressions
+        for vals in (matrix1_vals, matrix2_vals, result_matrix_vals):
+            expressions += [str(value) for value in vals.flat]
+        if self.reveal_mode == "cell":
+            expressions += [
+                self.calculation_string(row_vals, col_vals)
+                for row_vals in matrix1_vals
+                for col_vals in matrix2_vals.T
+            ]
+        return expressions
+
+    def calculation_string(self, row_vals, col_vals):
+        return "+".join([f"{r} \\times {c}" for r, c in zip(row_vals, col_vals)])
+
     def construct(self):
-        # Define the two matrices
-        
-        
         title = Text("Matrix Multiplication", font_size=48)
         self.play(Write(title))
         self.wait(1)
         self.play(title.animate.to_edge(UP))
         self.wait(1)
-        matrix1_vals = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
-        matrix2_vals = [[9, 8, 7], [6, 5, 4], [3, 2, 1]]
+        if self.use_heatmap():
+            self.construct_heatmap(title)
+            return
+        matrix1_vals = np.array(self.matrix1_vals)
+        matrix2_vals = np.array(self.matrix2_vals)
 
         # Create Manim Matrix objects
-        matrix1 = Matrix(matrix1_vals).scale(0.7)
-        matrix2 = Matrix(matrix2_vals).scale(0.7)
-        
+        matrix1 = Matrix(matrix1_vals.tolist()).scale(0.7)
+        matrix2 = Matrix(matrix2_vals.tolist()).scale(0.7)
+
         matrix1.set_color(RED)
         matrix2.set_color(BLUE)
         # Position the matrices
@@ -25,72 +83,170 @@ class MatrixMultiplicationAnimation(Scene):
         multiply_sign.next_to(matrix1, RIGHT, buff=0.4)
         matrix2.next_to(multiply_sign, RIGHT, buff=0.4)
 
-        # Display initial matrices and sign
-        self.play(Write(matrix1), Write(matrix2), Write(multiply_sign))
-        self.wait(1)
-
         # Calculate the result matrix
-        result_matrix_vals = [
-            [sum(a * b for a, b in zip(row, col)) for col in zip(*matrix2_vals)]
-            for row in matrix1_vals
-        ]
-        result_matrix = Matrix(result_matrix_vals).scale(0.8)
-        
+        result_matrix_vals = matrix1_vals @ matrix2_vals
+        result_matrix = Matrix(result_matrix_vals.tolist()).scale(0.8)
+
         # Group the matrices and the sign
         equation = VGroup(matrix1, multiply_sign, matrix2)
-        
+
         # # Animate moving the equation to the top
         # self.play(equation.animate.to_edge(UP, buff=0.5))
-        
+
         # Create an equals sign and position the result matrix
         equals_sign = MathTex("=").next_to(equation, RIGHT, buff=0.5)
         result_matrix.next_to(equals_sign, RIGHT, buff=0.5)
         result_matrix.set_color(GREEN)
 
+        # Shrink the whole equation if large matrices don't fit below the title
+        layout = VGroup(equation, equals_sign, result_matrix)
+        if get_fit_scale(layout, title) < 1:
+            fit_below(layout, title)
+
+        # Display initial matrices and sign
+        self.play(Write(matrix1), Write(matrix2), Write(multiply_sign))
+        self.wait(1)
+
         # Animate the appearance of the equals sign and the result matrix structure
         self.play(Write(equals_sign), Write(result_matrix.get_brackets()))
         self.wait(0.5)
 
-        # Animate the calculation of each element in the result matrix
-        for i in range(3):  # Row index
-            for j in range(3):  # Column index
+        if self.reveal_mode == "cell":
+            self.reveal_cells(matrix1, matrix2, result_matrix, matrix1_vals, matrix2_vals, result_matrix_vals)
+        else:
+            self.reveal_batches(matrix1, matrix2, result_matrix, result_matrix_vals.shape)
+        # Wait a moment to show the completed calculation
+        self.wait(1)
+
+        # Create a copy of the result matrix for the final display
+        final_result_matrix = result_matrix.copy().scale(1.2).move_to(ORIGIN)
+        if final_result_matrix.height > config.frame_height - 2:
+            final_result_matrix.scale_to_fit_height(config.frame_height - 2)
+
+        # Create a group of everything except the result matrix
+        everything_else = VGroup(matrix1, multiply_sign, matrix2, equals_sign)
+
+        # Animate: fade out everything else and move/scale the result matrix to center
+        self.play(
+            FadeOut(everything_else),
+            Transform(result_matrix, final_result_matrix),
+            run_time=1
+        )
+        result_label = Text("Result Matrix", font_size=36).next_to(final_result_matrix, DOWN, buff=0.8)
+        self.play(Write(result_label))
+
+        # Final pause to display the result
+        self.wait(3)
+
+    def construct_heatmap(self, title):
+        """Same walk-through with every matrix drawn as a single heatmap image"""
+        matrix1_vals = np.array(self.matrix1_vals)
+        matrix2_vals = np.array(self.matrix2_vals)
+        result_matrix_vals = matrix1_vals @ matrix2_vals
+
+        matrix1 = MatrixHeatmap(matrix1_vals, colormap=[BLACK, RED],
+                                vmin=matrix1_vals.min(), vmax=matrix1_vals.max())
+        matrix2 = MatrixHeatmap(matrix2_vals, colormap=[BLACK, BLUE],
+                                vmin=matrix2_vals.min(), vmax=matrix2_vals.max())
+        result_matrix = MatrixHeatmap(result_matrix_vals, colormap=[BLACK, GREEN], revealed=False,
+                                      vmin=result_matrix_vals.min(), vmax=result_matrix_vals.max())
+        result_frame = SurroundingRectangle(result_matrix, color=GREEN, buff=0.05)
+        result_group = Group(result_matrix, result_frame)
+        multiply_sign = MathTex(r"\times").scale(1.5)
+        equals_sign = MathTex("=")
+
+        layout = Group(matrix1, multiply_sign, matrix2, equals_sign, result_group)
+        layout.arrange(RIGHT, buff=0.4)
+        fit_below(layout, title)
+
+        self.play(FadeIn(matrix1), FadeIn(matrix2), Write(multiply_sign))
+        self.wait(1)
+        self.play(Write(equals_sign), Create(result_frame))
+        self.add(result_matrix)
+        self.wait(0.5)
+
+        inner_dim = matrix1_vals.shape[1]
+        highlights = HighlightPool(reuse=self.reuse_highlights)
+        for batch in self.get_reveal_batches(result_matrix_vals.shape):
+            row_ids = [i for i, _ in batch]
+            col_ids = [j for _, j in batch]
+            rowbox = matrix1.get_block_bounds((min(row_ids), max(row_ids)), (0, inner_dim - 1))
+            columbox = matrix2.get_block_bounds((0, inner_dim - 1), (min(col_ids), max(col_ids)))
+            stages = [
+                AnimationGroup(highlights.rectangle("row", *rowbox, color=YELLOW),
+                               highlights.rectangle("column", *columbox, color=YELLOW)),
+                result_matrix.reveal((np.array(row_ids), np.array(col_ids))),
+            ]
+            if len(batch) <= self.label_batch_limit:
+                labels = result_matrix.get_value_labels(batch, num_decimal_places=0)
+                stages += [FadeIn(labels), FadeOut(labels)]
+            stages.append(AnimationGroup(*highlights.hide("row", "column")))
+            # Only the result image is on screen beforehand; boxes and labels
+            # are added by their own stages
+            self.play(Succession(*stages, group=Group(result_matrix)), run_time=1.5)
+        highlights.remove_from(self)
+        self.wait(1)
+
+        # Fade out everything else and move/scale the result matrix to center
+        everything_else = Group(matrix1, multiply_sign, matrix2, equals_sign)
+        target_height = min(result_group.height * 1.2, config.frame_height - 2)
+        self.play(
+            FadeOut(everything_else),
+            result_group.animate.scale_to_fit_height(target_height).move_to(ORIGIN),
+            run_time=1
+        )
+        result_label = Text("Result Matrix", font_size=36).next_to(result_group, DOWN, buff=0.8)
+        self.play(Write(result_label))
+
+        # Final pause to display the result
+        self.wait(3)
+
+    def reveal_cells(self, matrix1, matrix2, result_matrix, matrix1_vals, matrix2_vals, result_matrix_vals):
+        """Animate the calculation of each element in the result matrix"""
+        n_rows, n_cols = result_matrix_vals.shape
+        highlights = HighlightPool(reuse=self.reuse_highlights)
+        for i in range(n_rows):  # Row index
+            for j in range(n_cols):  # Column index
                 # Highlight row from matrix1
                 matrix1.set_color(RED)
                 matrix2.set_color(BLUE)
                 row_to_highlight = matrix1.get_rows()[i]
-                
-                rowbox = SurroundingRectangle(row_to_highlight, buff = .1 ,corner_radius=0.1)
-                self.play(Create(rowbox), run_time=0.5)
+
+                self.play(highlights.surround("row", row_to_highlight, buff = .1 ,corner_radius=0.1), run_time=0.5)
                 # self.play(row_to_highlight.animate.set_color(YELLOW), run_time=0.3)
-                
+
                 # Highlight column from matrix2
                 col_to_highlight = matrix2.get_columns()[j]
-                
-                columbox = SurroundingRectangle(col_to_highlight, buff = .1 ,corner_radius=0.1)
-                self.play(Create(columbox), run_time=0.5)
+
+                self.play(highlights.surround("column", col_to_highlight, buff = .1 ,corner_radius=0.1), run_time=0.5)
                 # self.play(col_to_highlight.animate.set_color(ORANGE), run_time=0.3)
-                
+
                 # Create a temporary VGroup for the moving parts
                 moving_row = row_to_highlight.copy()
                 moving_col = col_to_highlight.copy()
-                row_group = VGroup(moving_row, rowbox)
-                col_group = VGroup(moving_col, columbox)
+                if self.reuse_highlights:
+                    # The boxes stay on the row and column for the next cell
+                    row_group = moving_row
+                    col_group = moving_col
+                else:
+                    row_group = VGroup(moving_row, highlights.mobjects["row"])
+                    col_group = VGroup(moving_col, highlights.mobjects["column"])
                 # Animate moving highlighted parts towards the result position
-                target_pos = result_matrix.get_entries()[i*3 + j].get_center()
-                
+                target_pos = result_matrix.get_entries()[i*n_cols + j].get_center()
+
                 # Show calculation
                 row_vals = matrix1_vals[i]
-                col_vals = [matrix2_vals[k][j] for k in range(3)]
-                calc_str = "+".join([f"{r} \\times {c}" for r, c in zip(row_vals, col_vals)])
+                col_vals = matrix2_vals[:, j]
+                calc_str = self.calculation_string(row_vals, col_vals)
                 calculation_tex = MathTex(calc_str, font_size=36).move_to(DOWN*2)
                 calculation_tex.set_color(GREEN)
                 self.play(
                     Transform(row_group, calculation_tex),
                     Transform(col_group, calculation_tex),
                     run_time=0.5
-                    
+
                 )
-        
+
                 # Show the result of the calculation
                 result_val = result_matrix_vals[i][j]
                 result_tex = MathTex(str(result_val), font_size=36).move_to(target_pos)
@@ -105,25 +261,39 @@ class MatrixMultiplicationAnimation(Scene):
                 # Replace the placeholder with the final value
                 self.play(
                     FadeOut(calculation_tex),
-                    Write(result_matrix.get_entries()[i*3 + j].move_to(target_pos))
+                    Write(result_matrix.get_entries()[i*n_cols + j].move_to(target_pos))
                 )
-        # Wait a moment to show the completed calculation
-        self.wait(1)
-        
-        # Create a copy of the result matrix for the final display
-        final_result_matrix = result_matrix.copy().scale(1.2).move_to(ORIGIN)
-        
-        # Create a group of everything except the result matrix
-        everything_else = VGroup(matrix1, multiply_sign, matrix2, equals_sign)
-        
-        # Animate: fade out everything else and move/scale the result matrix to center
-        self.play(
-            FadeOut(everything_else),
-            Transform(result_matrix, final_result_matrix),
-            run_time=1
-        )
-        result_label = Text("Result Matrix", font_size=36).next_to(final_result_matrix, DOWN, buff=0.8)
-        self.play(Write(result_label))
-        
-        # Final pause to display the result
-        self.wait(3)
+        if self.reuse_highlights:
+            self.play(*highlights.release())
+
+    def reveal_batches(self, matrix1, matrix2, result_matrix, shape):
+        """Reveal the result matrix one batch of cells per play"""
+        n_cols = shape[1]
+        rows = matrix1.get_rows()
+        columns = matrix2.get_columns()
+        entries = result_matrix.get_entries()
+        highlights = HighlightPool(reuse=self.reuse_highlights)
+        for batch in self.get_reveal_batches(shape):
+            # Cells in a batch always cover a contiguous range of rows and columns
+            row_ids = [i for i, _ in batch]
+            col_ids = [j for _, j in batch]
+            row_block = VGroup(*rows[min(row_ids):max(row_ids) + 1])
+            column_block = VGroup(*columns[min(col_ids):max(col_ids) + 1])
+            self.play(Succession(
+                AnimationGroup(highlights.surround("row", row_block, buff=.1, corner_radius=0.1),
+                               highlights.surround("column", column_block, buff=.1, corner_radius=0.1)),
+                AnimationGroup(*[Write(entries[i*n_cols + j]) for i, j in batch]),
+                AnimationGroup(*highlights.hide("row", "column")),
+            ), run_time=1.5)
+        highlights.remove_from(self)
+
+    def get_reveal_batches(self, shape):
+        """Return the result cells grouped into the batches revealed per play"""
+        return reveal_batches(shape, self.reveal_mode, self.batch_size)
+
+
+class LargeMatrixMultiplication(MatrixMultiplicationAnimation):
+    # 16×16 product (drawn as heatmaps) revealed one anti-diagonal wavefront per play
+    matrix1_vals = np.arange(16 * 16).reshape(16, 16) % 10
+    matrix2_vals = np.arange(16 * 16).reshape(16, 16).T % 7
+    reveal_mode = "wavefront"
@@ -0,0 +1,148 @@
+"""Render a scene once and encode it at several resolutions and formats
+
+Publishing at 480p, 1080p and 4K used to mean three runs of construct and
+three rasterizations of every frame. Here the timeline runs once, each frame
+is rasterized at the largest tier only, and the smaller tiers are box-filtered
+down from it. Every (tier, format) pair streams raw frames into its own ffmpeg
+process, so the encoders run in parallel with the rendering. All tiers share
+one frame rate, and manim's own movie writer (and with it the partial movie
+cache, which would skip frames for cached plays) is turned off:
+
+    python multires.py transformer.py TransformerWorkflow --tiers 480p 1080p 2160p \\
+        --formats mp4 webm -o media/multires
+"""
+import argparse
+import importlib
+import subprocess
+import time
+from pathlib import Path
+
+TIERS = {
+    "480p": (854, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "2160p": (3840, 2160),
+}
+FORMATS = {
+    "mp4": ["-c:v", "libx264", "-pix_fmt", "yuv420p"],
+    "webm": ["-c:v", "libvpx-vp9", "-pix_fmt", "yuva420p"],
+    "mov": ["-c:v", "prores_ks", "-pix_fmt", "yuva444p10le"],
+}
+
+
+class FrameEncoder:
+    """One ffmpeg process encoding raw RGBA frames of a fixed size"""
+
+    def __init__(self, path, size, frame_rate, video_format):
+        self.path = Path(path)
+        self.size = size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        width, height = size
+        command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}",
+            "-r", str(frame_rate), "-i", "-", "-an",
+            *FORMATS[video_format], str(self.path),
+        ]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame_bytes, num_frames=1):
+        for _ in range(num_frames):
+            self.process.stdin.write(frame_bytes)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed writing {self.path}")
+
+
+class MultiResolutionScene:
+    """Mixin feeding every rendered frame to the encoders in self.encoders"""
+
+    # Set by render_multiresolution before the scene is rendered
+    encoders = []
+
+    def setup(self):
+        super().setup()
+        self.frames_written = 0
+        file_writer = self.renderer.file_writer
+        write_frame = file_writer.write_frame
+
+        def write_all_tiers(frame, num_frames=1):
+            write_frame(frame, num_frames=num_frames)
+            self.write_tiers(frame, num_frames)
+
+        file_writer.write_frame = write_all_tiers
+
+    def write_tiers(self, frame, num_frames):
+        from PIL import Image
+
+        image = None
+        resized = {}
+        for encoder in self.encoders:
+            height, width = frame.shape[:2]
+            if encoder.size == (width, height):
+                data = frame.tobytes()
+            else:
+                # Each smaller size is filtered once, however many formats use it
+                if encoder.size not in resized:
+                    if image is None:
+                        image = Image.fromarray(frame, "RGBA")
+                    resized[encoder.size] = image.resize(encoder.size, Image.Resampling.BOX).tobytes()
+                data = resized[encoder.size]
+            encoder.write(data, num_frames)
+        self.frames_written += num_frames
+
+
+def render_multiresolution(scene_class, output_dir, tiers, formats, frame_rate=60):
+    """Render scene_class once and return the paths written for every tier and format"""
+    from manim import tempconfig
+
+    sizes = sorted((TIERS[tier], tier) for tier in tiers)
+    (width, height), _ = sizes[-1]
+    encoders = [
+        FrameEncoder(Path(output_dir) / f"{scene_class.__name__}_{tier}.{video_format}",
+                     size, frame_rate, video_format)
+        for size, tier in sizes
+        for video_format in formats
+    ]
+    multi_class = type(scene_class.__name__, (MultiResolutionScene, scene_class),
+                       {"encoders": encoders})
+    settings = {
+        "pixel_width": width,
+        "pixel_height": height,
+        "frame_rate": frame_rate,
+        "write_to_movie": False,
+        "disable_caching": True,
+    }
+    try:
+        with tempconfig(settings):
+            multi_class().render()
+    finally:
+        for encoder in encoders:
+            encoder.close()
+    return [encoder.path for encoder in encoders]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", help="scene file, e.g. transformer.py")
+    parser.add_argument("scene", help="scene class, e.g. TransformerWorkflow")
+    parser.add_argument("--tiers", nargs="+", choices=TIERS, default=["480p", "1080p", "2160p"])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=["mp4"])
+    parser.add_argument("--frame-rate", type=int, default=60)
+    parser.add_argument("-o", "--output-dir", default="media/multires")
+    args = parser.parse_args()
+
+    module = importlib.import_module(Path(args.module).stem)
+    start = time.perf_counter()
+    paths = render_multiresolution(getattr(module, args.scene), args.output_dir,
+                                   args.tiers, args.formats, args.frame_rate)
+    for path in paths:
+        print(path)
+    print(f"{len(paths)} outputs in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
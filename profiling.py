@@ -0,0 +1,149 @@
+"""Per-play profiling of the scenes, exported as a Chrome trace
+
+ProfiledScene wraps every play and wait and splits its time into mobject
+construction (scene code running since the previous call), interpolation,
+rasterization and encoding. The trace opens in chrome://tracing or
+https://ui.perfetto.dev:
+
+    python profiling.py transformer.py TransformerWorkflow -o trace.json
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from scenes import QUALITIES
+
+PHASES = ("interpolation", "rasterization", "encoding")
+# Scene methods that only pass a play/wait call through
+WRAPPERS = {"play", "wait", "_profiled", "_record"}
+
+
+def _now_us():
+    return time.perf_counter_ns() / 1000
+
+
+def calling_step(scene):
+    """Name of the step_* method (or else the nearest scene method) that called play/wait"""
+    nearest = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        name = frame.f_code.co_name
+        if frame.f_locals.get("self") is scene and name not in WRAPPERS:
+            if name.startswith("step_"):
+                return name
+            nearest = nearest or name
+        frame = frame.f_back
+    return nearest
+
+
+class ProfiledScene:
+    """Mixin recording one trace event per play and wait"""
+
+    def setup(self):
+        super().setup()
+        self.trace_events = []
+        self._phase_totals = None
+        self._frames = 0
+        self._last_call_end = _now_us()
+        self._instrument_renderer()
+
+    def _instrument_renderer(self):
+        # Wrap the per-frame hooks of the Cairo renderer on this instance only
+        renderer = self.renderer
+        self.update_to_time = self._timed(self.update_to_time, "interpolation")
+        renderer.update_frame = self._timed(renderer.update_frame, "rasterization")
+        file_writer = renderer.file_writer
+        file_writer.write_frame = self._timed(file_writer.write_frame, "encoding", count_frames=True)
+
+    def _timed(self, method, phase, count_frames=False):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                if self._phase_totals is not None:
+                    self._phase_totals[phase] += (time.perf_counter_ns() - start) / 1000
+                    if count_frames:
+                        # write_frame(frame, num_frames): a frozen-frame wait is one call
+                        self._frames += kwargs.get("num_frames", args[1] if len(args) > 1 else 1)
+        return wrapper
+
+    def _profiled(self, kind, call, args, kwargs):
+        step = calling_step(self)
+        start = _now_us()
+        construction = start - self._last_call_end
+        self._phase_totals = dict.fromkeys(PHASES, 0.0)
+        self._frames = 0
+        try:
+            return call(*args, **kwargs)
+        finally:
+            end = _now_us()
+            self.trace_events.append({
+                "name": f"{kind} {step}" if step else kind,
+                "cat": kind,
+                "ph": "X",
+                "ts": start,
+                "dur": end - start,
+                "pid": os.getpid(),
+                "tid": 1,
+                "args": {
+                    "step": step,
+                    "animations": len(args) if kind == "play" else 0,
+                    "mobject_family_size": len(self.get_mobject_family_members()),
+                    "frames": self._frames,
+                    "construction_us": construction,
+                    **{f"{phase}_us": total for phase, total in self._phase_totals.items()},
+                },
+            })
+            # Construction shows up as its own slice just before the call
+            if construction > 0:
+                self.trace_events.append({
+                    "name": "construction", "cat": "construction", "ph": "X",
+                    "ts": self._last_call_end, "dur": construction,
+                    "pid": os.getpid(), "tid": 1, "args": {"step": step},
+                })
+            self._phase_totals = None
+            self._last_call_end = end
+
+    def play(self, *args, **kwargs):
+        return self._profiled("play", super().play, args, kwargs)
+
+    def wait(self, *args, **kwargs):
+        return self._profiled("wait", super().wait, args, kwargs)
+
+    def write_trace(self, path):
+        Path(path).write_text(json.dumps({"traceEvents": self.trace_events}, indent=1))
+
+
+def profile_scene(scene_class, output):
+    """Render scene_class with profiling and write its Chrome trace to output"""
+    profiled_class = type(f"Profiled{scene_class.__name__}", (ProfiledScene, scene_class), {})
+    scene = profiled_class()
+    scene.render()
+    scene.write_trace(output)
+    return scene.trace_events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", help="scene file, e.g. transformer.py")
+    parser.add_argument("scene", help="scene class, e.g. TransformerWorkflow")
+    parser.add_argument("-o", "--output", default="trace.json")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    args = parser.parse_args()
+
+    from manim import tempconfig
+
+    module = importlib.import_module(Path(args.module).stem)
+    with tempconfig({"quality": QUALITIES[args.quality], "disable_caching": True}):
+        events = profile_scene(getattr(module, args.scene), args.output)
+    calls = [e for e in events if e["cat"] != "construction"]
+    print(f"{len(calls)} plays/waits written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Order in which the result cells of a product are revealed, one group per play
+
+Pure index arithmetic, shared by MatrixMultiplicationAnimation and
+AttentionScene and importable without manim.
+"""
+
+
+def reveal_batches(shape, mode, batch_size=None):
+    """Return the cells of a shape grouped into the batches revealed per play
+
+    mode is "cell", "row", "column" or "wavefront" (anti-diagonals); groups
+    are split into batches of at most batch_size cells (None for whole groups).
+    """
+    n_rows, n_cols = shape
+    if mode == "cell":
+        groups = [[(i, j)] for i in range(n_rows) for j in range(n_cols)]
+    elif mode == "row":
+        groups = [[(i, j) for j in range(n_cols)] for i in range(n_rows)]
+    elif mode == "column":
+        groups = [[(i, j) for i in range(n_rows)] for j in range(n_cols)]
+    elif mode == "wavefront":
+        groups = [
+            [(i, d - i) for i in range(max(0, d - n_cols + 1), min(n_rows, d + 1))]
+            for d in range(n_rows + n_cols - 1)
+        ]
+    else:
+        raise ValueError(f"Unknown reveal mode: {mode}")
+
+    return [
+        group[start:start + batch_size] if batch_size else group
+        for group in groups
+        for start in range(0, len(group), batch_size or len(group))
+    ]
+
+
+def reveal_tiles(shape, mode, tile_size):
+    """Return the ((row_start, row_end), (col_start, col_end)) blocks revealed per play"""
+    n_rows, n_cols = shape
+    if mode == "whole":
+        return [((0, n_rows - 1), (0, n_cols - 1))]
+    if mode != "tiled":
+        raise ValueError(f"Unknown reveal mode: {mode}")
+    return [
+        ((r, min(r + tile_size, n_rows) - 1), (c, min(c + tile_size, n_cols) - 1))
+        for r in range(0, n_rows, tile_size)
+        for c in range(0, n_cols, tile_size)
+    ]
@@ -0,0 +1,248 @@
+"""List, validate and render the scenes without importing manim up front
+
+The scene modules start with `from manim import *`, which takes seconds. The
+registry finds their Scene subclasses and class-level parameters by parsing
+the source with ast instead, so listing scenes and validating job files only
+costs the interpreter start; manim and NumPy are imported by `render` alone:
+
+    python scenes.py list
+    python scenes.py validate jobs.jsonl
+    python scenes.py render TransformerWorkflow -q l
+    python scenes.py startup
+"""
+import argparse
+import ast
+import importlib
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Only the standard library is imported above, so this is as early as it needs to be
+START = time.perf_counter()
+
+ROOT = Path(__file__).resolve().parent
+SCENE_MODULES = ["transformer.py", "matric_multiplication.py", "attention.py"]
+# manim base classes a scene can derive from
+SCENE_BASES = {"Scene", "MovingCameraScene", "ThreeDScene", "ZoomedScene"}
+# Quality letters taken by every command line (as in manim -ql)
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+class SceneInfo:
+    def __init__(self, name, module, bases, params, lineno):
+        self.name = name
+        self.module = module
+        self.bases = bases
+        # Class attribute name -> source of its value, including inherited ones
+        self.params = params
+        self.lineno = lineno
+
+    def load(self):
+        """Import the scene's module (and with it manim) and return the class"""
+        sys.path.insert(0, str(ROOT))
+        return getattr(importlib.import_module(self.module), self.name)
+
+
+def _base_name(node):
+    # Scene, manim.Scene
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _class_params(node):
+    params = {}
+    for statement in node.body:
+        if isinstance(statement, ast.Assign):
+            targets, value = statement.targets, statement.value
+        elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            targets, value = [statement.target], statement.value
+        else:
+            continue
+        for target in targets:
+            if isinstance(target, ast.Name) and not target.id.startswith("_"):
+                params[target.id] = ast.unparse(value)
+    return params
+
+
+def discover(paths=SCENE_MODULES, root=ROOT):
+    """Return {name: SceneInfo} for every Scene subclass defined in paths"""
+    classes = {}
+    for path in paths:
+        tree = ast.parse((Path(root) / path).read_text(), filename=str(path))
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                bases = [name for name in map(_base_name, node.bases) if name]
+                classes[node.name] = (Path(path).stem, bases, _class_params(node), node.lineno)
+
+    scenes = {}
+
+    def resolve(name):
+        # A class is a scene if any base is a manim scene or another scene here
+        if name in scenes:
+            return scenes[name]
+        if name not in classes:
+            return None
+        module, bases, own_params, lineno = classes[name]
+        params = {}
+        is_scene = False
+        for base in bases:
+            base_info = resolve(base)
+            if base_info is not None:
+                is_scene = True
+                params.update(base_info.params)
+            elif base in SCENE_BASES:
+                is_scene = True
+        if not is_scene:
+            return None
+        params.update(own_params)
+        scenes[name] = SceneInfo(name, module, bases, params, lineno)
+        return scenes[name]
+
+    for name in classes:
+        resolve(name)
+    return scenes
+
+
+def validate_jobs(path, scenes):
+    """Return a list of problems with a batch.py jobs file, empty if it is valid"""
+    from batch import JOB_ATTRIBUTES
+
+    aliases = {"transformer": "TransformerWorkflow", "matrix": "MatrixMultiplicationAnimation"}
+    problems = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as error:
+                problems.append(f"line {line_number}: {error}")
+                continue
+            kind = job.get("scene", "transformer")
+            scene = scenes.get(aliases.get(kind, kind))
+            if kind not in JOB_ATTRIBUTES or scene is None:
+                problems.append(f"line {line_number}: unknown scene {kind!r}")
+                continue
+            attributes = [JOB_ATTRIBUTES[kind][key] for key in JOB_ATTRIBUTES[kind] if key in job]
+            for attribute in attributes + list(job.get("params", {})):
+                if attribute not in scene.params:
+                    problems.append(f"line {line_number}: {scene.name} has no parameter {attribute!r}")
+            if job.get("quality", "l") not in QUALITIES:
+                problems.append(f"line {line_number}: unknown quality {job['quality']!r}, "
+                                f"choose from {', '.join(QUALITIES)}")
+            if kind == "matrix":
+                problems += [f"line {line_number}: {problem}" for problem in _matrix_problems(job)]
+    return problems
+
+
+def _matrix_shape(values):
+    """(rows, columns) of a list of equally long rows, None for anything else"""
+    if not isinstance(values, list) or not values or not all(isinstance(row, list) for row in values):
+        return None
+    if len({len(row) for row in values}) != 1 or not values[0]:
+        return None
+    return len(values), len(values[0])
+
+
+def _matrix_problems(job):
+    params = job.get("params", {})
+    matrices = {
+        "matrix1": job.get("matrix1", params.get("matrix1_vals")),
+        "matrix2": job.get("matrix2", params.get("matrix2_vals")),
+    }
+    shapes = {}
+    problems = []
+    for key, values in matrices.items():
+        # Unset matrices fall back to the scene's defaults
+        if values is None:
+            continue
+        shapes[key] = _matrix_shape(values)
+        if shapes[key] is None:
+            problems.append(f"{key} is not a non-empty list of equally long rows")
+    if shapes.get("matrix1") and shapes.get("matrix2") and shapes["matrix1"][1] != shapes["matrix2"][0]:
+        problems.append(f"matrix1 is {shapes['matrix1'][0]}×{shapes['matrix1'][1]} but matrix2 is "
+                        f"{shapes['matrix2'][0]}×{shapes['matrix2'][1]}, inner dimensions must match")
+    return problems
+
+
+def render(scene_info, quality):
+    from manim import tempconfig
+
+    with tempconfig({"quality": quality}):
+        scene_info.load()().render()
+
+
+def measure_startup():
+    """Time fresh interpreters listing the scenes, importing the data layer and a scene module"""
+    commands = {
+        "python": "pass",
+        "scenes.discover": "import scenes; scenes.discover()",
+        "workflow_data": "import workflow_data",
+        "transformer (manim)": "import transformer",
+    }
+    timings = {}
+    for label, code in commands.items():
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True)
+        # None when the import fails, e.g. manim is not installed
+        timings[label] = time.perf_counter() - start if result.returncode == 0 else None
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    list_parser = commands.add_parser("list", help="list scenes and their parameters")
+    list_parser.add_argument("--json", action="store_true")
+    validate_parser = commands.add_parser("validate", help="check a batch.py jobs file")
+    validate_parser.add_argument("jobs")
+    render_parser = commands.add_parser("render", help="render one scene")
+    render_parser.add_argument("scene")
+    render_parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    commands.add_parser("startup", help="measure cold-start times in fresh processes")
+    args = parser.parse_args()
+
+    if args.command == "startup":
+        for label, seconds in measure_startup().items():
+            print(f"{label:<22} " + (f"{seconds * 1000:8.1f} ms" if seconds is not None else "  failed"))
+        return
+
+    scenes = discover()
+    if args.command == "list":
+        if args.json:
+            print(json.dumps({name: {"module": info.module, "params": info.params}
+                              for name, info in scenes.items()}, indent=2))
+        else:
+            for name, info in scenes.items():
+                print(f"{name} ({info.module}.py:{info.lineno}): {', '.join(info.params)}")
+    elif args.command == "validate":
+        problems = validate_jobs(args.jobs, scenes)
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+        print(f"{args.jobs}: ok")
+    elif args.command == "render":
+        if args.scene not in scenes:
+            parser.error(f"unknown scene {args.scene!r}, choose from {', '.join(scenes)}")
+        render(scenes[args.scene], QUALITIES[args.quality])
+
+    # Reported on stderr so list --json stays parseable
+    elapsed = (time.perf_counter() - START) * 1000
+    print(f"{args.command} took {elapsed:.1f} ms (manim imported: {'manim' in sys.modules})",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
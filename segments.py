@@ -0,0 +1,217 @@
+"""Render TransformerWorkflow one step at a time and stitch the cached segments
+
+Each step of the workflow is rendered as its own scene starting from the
+state snapshot taken at the previous step boundary. The segment movie and the
+exit state are stored under a key built from the source of every local module
+the scene uses, its class attributes, the step's entry state and the render
+settings, so only steps whose inputs changed are re-rendered.
+With --jobs the missing segments are rendered in separate worker processes.
+Every worker rebuilds its step's entry state, so the joined movie matches a
+serial render frame for frame.
+
+    python segments.py -q l -o workflow.mp4
+    python segments.py -q h --jobs 4
+"""
+import argparse
+import ast
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import config, tempconfig
+
+from scenes import QUALITIES
+from transformer import TransformerWorkflow
+
+CACHE_DIR = Path("media") / "segments"
+ROOT = Path(__file__).resolve().parent
+
+
+def make_segment_scene(scene_class, step, entry_state):
+    """Return a scene class that restores entry_state and plays a single step"""
+
+    class SegmentScene(scene_class):
+        def construct(self):
+            self.restore_state(entry_state)
+            if step == self.steps[0]:
+                self.show_title()
+            self.play_step(step)
+
+    SegmentScene.__name__ = f"{scene_class.__name__}_{step}"
+    return SegmentScene
+
+
+def local_sources(scene_class):
+    """Return the source of every module in this repository a scene's segments run
+
+    Starts from segments.py and the modules defining the scene's classes and
+    follows their imports (including imports inside functions) of other
+    modules here, so any code change invalidates the segments it can affect.
+    """
+    pending = [Path(__file__)]
+    for klass in scene_class.__mro__:
+        module_file = getattr(sys.modules.get(klass.__module__), "__file__", None)
+        if module_file:
+            pending.append(Path(module_file))
+    sources = {}
+    while pending:
+        path = pending.pop().resolve()
+        if path in sources or path.parent != ROOT or not path.exists():
+            continue
+        sources[path] = path.read_text(encoding="utf-8")
+        for node in ast.walk(ast.parse(sources[path])):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module]
+            else:
+                continue
+            pending += [ROOT / f"{name.split('.')[0]}.py" for name in names]
+    return [sources[path] for path in sorted(sources)]
+
+
+def segment_key(scene_class, step, entry_state):
+    """Cache key from the scene's code and parameters, the step's entry state and the render settings"""
+    digest = hashlib.sha256()
+    digest.update(f"{scene_class.__name__}.{step}".encode())
+    for source in local_sources(scene_class):
+        digest.update(source.encode())
+    digest.update(json.dumps(scene_class.step_params(), sort_keys=True, default=str).encode())
+    digest.update(json.dumps(entry_state, sort_keys=True).encode())
+    digest.update(json.dumps(scene_class.step_waits[step]).encode())
+    render_settings = [config.pixel_width, config.pixel_height, config.frame_rate]
+    digest.update(json.dumps(render_settings).encode())
+    return digest.hexdigest()[:16]
+
+
+def load_segment(key, cache_dir=CACHE_DIR):
+    """Return (movie path, exit state) for a cached segment, or None"""
+    movie = cache_dir / f"{key}.mp4"
+    state_file = cache_dir / f"{key}.json"
+    if not movie.exists() or not state_file.exists():
+        return None
+    return movie, json.loads(state_file.read_text())
+
+
+def render_segment(scene_class, step, entry_state, key, cache_dir=CACHE_DIR):
+    """Render one step into the cache and return (movie path, exit state)"""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as work_dir:
+        with tempconfig({"media_dir": work_dir, "output_file": key}):
+            scene = make_segment_scene(scene_class, step, entry_state)()
+            scene.render()
+            movie = Path(scene.renderer.file_writer.movie_file_path)
+            exit_state = scene.get_state()
+        shutil.copyfile(movie, cache_dir / f"{key}.mp4")
+    (cache_dir / f"{key}.json").write_text(json.dumps(exit_state, sort_keys=True))
+    return cache_dir / f"{key}.mp4", exit_state
+
+
+def concat_segments(movies, output):
+    """Join segment movies into one file without re-encoding"""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for movie in movies:
+            listing.write(f"file '{Path(movie).resolve()}'\n")
+    try:
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+             "-i", listing.name, "-c", "copy", str(output)],
+            check=True,
+        )
+    finally:
+        Path(listing.name).unlink()
+    return output
+
+
+def plan_entry_states(scene_class):
+    """Return the entry state of every step from a pass that skips all animations"""
+    entry_states = []
+
+    class PlanScene(scene_class):
+        def play_step(self, step):
+            entry_states.append(self.get_state())
+            super().play_step(step)
+
+    with tempconfig({"dry_run": True, "skip_animations": True}):
+        PlanScene().render()
+    return entry_states
+
+
+def _render_segment_job(scene_class, step, entry_state, key, render_settings, cache_dir):
+    # Runs in a worker process, which does not share the parent's config
+    with tempconfig(render_settings):
+        return render_segment(scene_class, step, entry_state, key, cache_dir)
+
+
+def render_workflow(output, scene_class=TransformerWorkflow, force=False,
+                    cache_dir=CACHE_DIR, jobs=1):
+    """Render every step, reusing cached segments, and join them into output"""
+    if jobs > 1:
+        return render_workflow_parallel(output, scene_class, force, cache_dir, jobs)
+
+    state = {"completed": []}
+    movies = []
+    for step in scene_class.steps:
+        key = segment_key(scene_class, step, state)
+        cached = None if force else load_segment(key, cache_dir)
+        if cached is None:
+            print(f"{step}: rendering ({key})")
+            movie, state = render_segment(scene_class, step, state, key, cache_dir)
+        else:
+            print(f"{step}: cached ({key})")
+            movie, state = cached
+        movies.append(movie)
+    return concat_segments(movies, output)
+
+
+def render_workflow_parallel(output, scene_class, force, cache_dir, jobs):
+    """Render the missing segments concurrently, one worker process per step"""
+    entry_states = plan_entry_states(scene_class)
+    keys = [
+        segment_key(scene_class, step, state)
+        for step, state in zip(scene_class.steps, entry_states)
+    ]
+    render_settings = {
+        "pixel_width": config.pixel_width,
+        "pixel_height": config.pixel_height,
+        "frame_rate": config.frame_rate,
+    }
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for step, state, key in zip(scene_class.steps, entry_states, keys):
+            if force or load_segment(key, cache_dir) is None:
+                print(f"{step}: rendering ({key})")
+                futures[key] = pool.submit(
+                    _render_segment_job, scene_class, step, state, key, render_settings, cache_dir
+                )
+            else:
+                print(f"{step}: cached ({key})")
+        movies = [
+            futures[key].result()[0] if key in futures else load_segment(key, cache_dir)[0]
+            for key in keys
+        ]
+    return concat_segments(movies, output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default="media/TransformerWorkflow.mp4")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("--force", action="store_true", help="re-render every step")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="render steps in this many worker processes")
+    args = parser.parse_args()
+
+    with tempconfig({"quality": QUALITIES[args.quality]}):
+        print(render_workflow(args.output, force=args.force, jobs=args.jobs))
+
+
+if __name__ == "__main__":
+    main()
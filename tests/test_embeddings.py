@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from embeddings import gather_rows, open_embedding_table
+from workflow_data import TransformerData
+
+VOCAB = {"The": 1, "cat": 5, "sits": 8}
+
+
+@pytest.fixture
+def table():
+    return np.arange(10 * 6, dtype=np.float32).reshape(10, 6)
+
+
+def test_npy_table_is_memory_mapped_and_gathered(tmp_path, table):
+    path = tmp_path / "table.npy"
+    np.save(path, table)
+    opened = open_embedding_table(path)
+    assert isinstance(opened, np.memmap)
+    rows = gather_rows(opened, [5, 1, 5])
+    np.testing.assert_array_equal(rows, table[[5, 1, 5]])
+    assert not isinstance(rows, np.memmap)
+
+
+def test_raw_dump_needs_and_uses_its_shape(tmp_path, table):
+    path = tmp_path / "table.bin"
+    table.tofile(path)
+    with pytest.raises(ValueError, match="explicit shape"):
+        open_embedding_table(path)
+    opened = open_embedding_table(path, shape=table.shape)
+    np.testing.assert_array_equal(gather_rows(opened, [8, 0]), table[[8, 0]])
+
+
+def test_build_reads_rows_and_dim_from_the_table(tmp_path, table):
+    path = tmp_path / "table.npy"
+    np.save(path, table)
+    data = TransformerData.build("The cat sits The", VOCAB, embedding_path=path, embedding_dim=4)
+    assert data.embedding_dim == 6
+    np.testing.assert_array_equal(data.table_embeddings, table[[1, 5, 8]])
+    np.testing.assert_array_equal(data.embeddings, table[[1, 5, 8, 1]])
+
+
+def test_build_raw_table_without_shape_raises(tmp_path, table):
+    path = tmp_path / "table.bin"
+    table.tofile(path)
+    with pytest.raises(ValueError, match="explicit shape"):
+        TransformerData.build("The cat", VOCAB, embedding_path=path)
+    data = TransformerData.build("The cat", VOCAB, embedding_path=path, embedding_shape=table.shape)
+    np.testing.assert_array_equal(data.embeddings, table[[1, 5]])
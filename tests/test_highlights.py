@@ -0,0 +1,75 @@
+import pytest
+
+manim = pytest.importorskip("manim")
+import numpy as np
+
+from highlights import HighlightPool
+
+
+def play(animation):
+    animation.begin()
+    animation.interpolate(0.5)
+    animation.finish()
+
+
+def count_allocations(monkeypatch, n):
+    """Mobjects built or copied while moving and hiding pooled highlights n times"""
+    counts = {"mobjects": 0}
+    init = manim.Mobject.__init__
+    copy = manim.Mobject.copy
+
+    def counting_init(self, *args, **kwargs):
+        counts["mobjects"] += 1
+        init(self, *args, **kwargs)
+
+    def counting_copy(self, *args, **kwargs):
+        counts["mobjects"] += 1
+        return copy(self, *args, **kwargs)
+
+    monkeypatch.setattr(manim.Mobject, "__init__", counting_init)
+    monkeypatch.setattr(manim.Mobject, "copy", counting_copy)
+    pool = HighlightPool()
+    for i in range(n):
+        play(pool.rectangle("box", 1 + i % 3, 1, manim.RIGHT * i))
+        play(pool.arrow("arrow", manim.LEFT * i, manim.UP + manim.RIGHT * i))
+        for animation in pool.hide("box", "arrow"):
+            play(animation)
+    monkeypatch.undo()
+    return counts["mobjects"]
+
+
+def test_reused_highlights_allocate_nothing_per_move(monkeypatch):
+    assert count_allocations(monkeypatch, 20) == count_allocations(monkeypatch, 5)
+
+
+def test_resized_rounded_rectangle_keeps_its_corners():
+    small = manim.Square(1)
+    large = manim.Rectangle(width=3, height=2).shift(manim.RIGHT * 2)
+    pool = HighlightPool()
+    play(pool.surround("box", small, buff=0.1, corner_radius=0.1))
+    play(pool.surround("box", large, buff=0.1, corner_radius=0.1))
+    expected = manim.SurroundingRectangle(large, buff=0.1, corner_radius=0.1)
+    np.testing.assert_allclose(pool.mobjects["box"].get_anchors(), expected.get_anchors(), atol=1e-6)
+
+
+def test_moved_arrow_keeps_its_tip():
+    pool = HighlightPool()
+    play(pool.arrow("arrow", manim.LEFT, manim.RIGHT, buff=0))
+    arrow = pool.mobjects["arrow"]
+    tip_length = arrow.tip.length
+    play(pool.arrow("arrow", manim.UP * 2, manim.UP * 2 + manim.RIGHT * 3, buff=0))
+    np.testing.assert_allclose(arrow.get_start(), manim.UP * 2, atol=1e-6)
+    np.testing.assert_allclose(arrow.tip.tip_point, manim.UP * 2 + manim.RIGHT * 3, atol=1e-6)
+    assert arrow.tip.length == pytest.approx(tip_length)
+
+
+def test_hidden_highlight_comes_back_at_full_opacity():
+    pool = HighlightPool()
+    play(pool.rectangle("box", 1, 1, manim.ORIGIN, color=manim.YELLOW))
+    for animation in pool.hide("box"):
+        play(animation)
+    box = pool.mobjects["box"]
+    assert box.get_stroke_opacity() == 0
+    play(pool.rectangle("box", 2, 1, manim.RIGHT))
+    assert box.get_stroke_opacity() == 1
+    assert box.get_fill_opacity() == 0
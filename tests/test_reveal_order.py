@@ -0,0 +1,43 @@
+import pytest
+
+from reveal_order import reveal_batches, reveal_tiles
+
+
+def test_cell_row_and_column_batches():
+    assert reveal_batches((2, 2), "cell") == [[(0, 0)], [(0, 1)], [(1, 0)], [(1, 1)]]
+    assert reveal_batches((2, 3), "row") == [[(0, 0), (0, 1), (0, 2)], [(1, 0), (1, 1), (1, 2)]]
+    assert reveal_batches((2, 2), "column") == [[(0, 0), (1, 0)], [(0, 1), (1, 1)]]
+
+
+def test_wavefront_walks_anti_diagonals():
+    assert reveal_batches((2, 3), "wavefront") == [
+        [(0, 0)], [(0, 1), (1, 0)], [(0, 2), (1, 1)], [(1, 2)]
+    ]
+
+
+@pytest.mark.parametrize("mode", ["cell", "row", "column", "wavefront"])
+def test_every_cell_is_revealed_once(mode):
+    batches = reveal_batches((3, 5), mode, batch_size=2)
+    cells = [cell for batch in batches for cell in batch]
+    assert sorted(cells) == [(i, j) for i in range(3) for j in range(5)]
+    assert all(len(batch) <= 2 for batch in batches)
+
+
+def test_batch_size_splits_groups():
+    assert reveal_batches((1, 5), "row", batch_size=2) == [
+        [(0, 0), (0, 1)], [(0, 2), (0, 3)], [(0, 4)]
+    ]
+
+
+def test_tiles_cover_ragged_edges():
+    assert reveal_tiles((3, 5), "whole", 2) == [((0, 2), (0, 4))]
+    assert reveal_tiles((3, 3), "tiled", 2) == [
+        ((0, 1), (0, 1)), ((0, 1), (2, 2)), ((2, 2), (0, 1)), ((2, 2), (2, 2))
+    ]
+
+
+def test_unknown_modes_raise():
+    with pytest.raises(ValueError, match="diagonal"):
+        reveal_batches((2, 2), "diagonal")
+    with pytest.raises(ValueError, match="cell"):
+        reveal_tiles((2, 2), "cell", 2)
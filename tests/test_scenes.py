@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+import batch
+from scenes import discover, validate_jobs
+
+
+def write_jobs(tmp_path, *jobs):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text("\n".join(json.dumps(job) for job in jobs) + "\n")
+    return path
+
+
+def test_valid_jobs_pass(tmp_path):
+    path = write_jobs(
+        tmp_path,
+        {"scene": "transformer", "sentence": "The cat", "quality": "m"},
+        {"scene": "matrix", "matrix1": [[1, 2, 3]], "matrix2": [[1], [2], [3]]},
+    )
+    assert validate_jobs(path, discover()) == []
+
+
+def test_unknown_quality_is_reported(tmp_path):
+    path = write_jobs(tmp_path, {"scene": "transformer", "quality": "z"})
+    [problem] = validate_jobs(path, discover())
+    assert "unknown quality 'z'" in problem
+    with pytest.raises(ValueError, match="unknown quality"):
+        batch.read_jobs(path, tmp_path)
+
+
+def test_mismatched_matrices_are_reported(tmp_path):
+    path = write_jobs(
+        tmp_path,
+        {"scene": "matrix", "matrix1": [[1, 2], [3, 4]], "matrix2": [[1, 2, 3]]},
+        {"scene": "matrix", "matrix1": [[1, 2], [3]]},
+    )
+    problems = validate_jobs(path, discover())
+    assert len(problems) == 2
+    assert "line 1" in problems[0] and "inner dimensions" in problems[0]
+    assert "line 2" in problems[1] and "equally long rows" in problems[1]
@@ -0,0 +1,48 @@
+from text_cache import TextCache
+
+
+def make_cache(maxsize=4096):
+    built = []
+
+    def factory(text, **kwargs):
+        built.append(text)
+        return {"text": text, **kwargs}
+
+    return TextCache(maxsize=maxsize, factory=factory), built
+
+
+def test_repeated_text_is_built_once_and_copied():
+    cache, built = make_cache()
+    first = cache.get("42", font_size=12)
+    second = cache.get("42", font_size=12)
+    assert built == ["42"]
+    assert first == second and first is not second
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+
+def test_arguments_are_part_of_the_key():
+    cache, built = make_cache()
+    cache.get("42", font_size=12)
+    cache.get("42", font_size=14)
+    cache.get("42", font_size=12, color="#FF0000")
+    assert built == ["42", "42", "42"]
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache, built = make_cache(maxsize=2)
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+    cache.get("c")  # evicts "b", the least recently used
+    cache.get("a")
+    cache.get("b")
+    assert built == ["a", "b", "c", "b"]
+    assert cache.stats()["evictions"] == 2
+
+
+def test_clear_resets_entries_and_counts():
+    cache, _ = make_cache()
+    cache.get("a")
+    cache.get("a")
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "evictions": 0, "size": 0}
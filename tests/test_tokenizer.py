@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from tokenizer import BPETokenizer, WordPieceTokenizer, load_tokenizer, token_to_id
+
+BPE_VOCAB = {"low": 0, "Ġlow": 1, "er": 2, "Ġ": 3, "l": 4, "o": 5, "w": 6, "e": 7, "r": 8}
+BPE_MERGES = [("l", "o"), ("lo", "w"), ("e", "r"), ("Ġ", "low")]
+WORDPIECE_LINES = ["[PAD]", "[UNK]", "the", "cat", "##s", "sit"]
+
+
+@pytest.fixture
+def wordpiece_path(tmp_path):
+    path = tmp_path / "vocab.txt"
+    path.write_text("\n".join(WORDPIECE_LINES) + "\n", encoding="utf-8")
+    return path
+
+
+def test_bpe_applies_merges_by_rank():
+    tokenizer = BPETokenizer(BPE_VOCAB, BPE_MERGES)
+    tokens = tokenizer.tokenize("low lower")
+    assert tokens == ["low", "Ġlow", "er"]
+    assert [tokenizer.token_to_id(token) for token in tokens] == [0, 1, 2]
+
+
+def test_bpe_iter_tokens_is_lazy():
+    tokenizer = BPETokenizer(BPE_VOCAB, BPE_MERGES)
+    tokens = tokenizer.iter_tokens("low " * 1000)
+    assert next(tokens) == "low"
+    assert len(tokenizer.word_cache) == 1
+
+
+def test_bpe_unknown_token_raises_without_unk_entry():
+    tokenizer = BPETokenizer(BPE_VOCAB, BPE_MERGES)
+    with pytest.raises(ValueError, match="'x'"):
+        tokenizer.token_to_id("x")
+
+
+def test_bpe_unknown_token_uses_unk_entry():
+    tokenizer = BPETokenizer({**BPE_VOCAB, "<unk>": 9}, BPE_MERGES, unk_token="<unk>")
+    assert tokenizer.token_to_id("x") == 9
+
+
+def test_wordpiece_longest_match(wordpiece_path):
+    tokenizer = WordPieceTokenizer.from_file(wordpiece_path)
+    tokens = tokenizer.tokenize("The cats sit")
+    assert tokens == ["the", "cat", "##s", "sit"]
+    assert [tokenizer.token_to_id(token) for token in tokens] == [2, 3, 4, 5]
+
+
+def test_wordpiece_unknown_word_maps_to_unk(wordpiece_path):
+    tokenizer = WordPieceTokenizer.from_file(wordpiece_path)
+    assert tokenizer.tokenize("dog") == ["[UNK]"]
+    assert tokenizer.token_to_id("[UNK]") == 1
+    assert tokenizer.token_to_id("dog") == 1
+
+
+def test_wordpiece_without_unk_entry_raises():
+    tokenizer = WordPieceTokenizer({"the": 0})
+    with pytest.raises(ValueError, match="'\\[UNK\\]'"):
+        tokenizer.token_to_id(tokenizer.tokenize("dog")[0])
+
+
+def test_token_to_id_policy():
+    vocab = {"The": 1, "[UNK]": 0}
+    assert token_to_id(vocab, "The") == 1
+    assert token_to_id(vocab, "dog") == 0
+    with pytest.raises(ValueError, match="'dog'"):
+        token_to_id({"The": 1}, "dog")
+
+
+def test_load_tokenizer_caches_index(tmp_path, wordpiece_path):
+    cache_dir = tmp_path / "cache"
+    first = load_tokenizer(wordpiece_path, cache_dir=cache_dir)
+    (pickle_file,) = cache_dir.glob("*.pkl")
+    second = load_tokenizer(wordpiece_path, cache_dir=cache_dir)
+    assert second.vocab == first.vocab
+    assert list(cache_dir.iterdir()) == [pickle_file]
+
+
+def test_load_tokenizer_ignores_unreadable_pickle(tmp_path, wordpiece_path):
+    cache_dir = tmp_path / "cache"
+    load_tokenizer(wordpiece_path, cache_dir=cache_dir)
+    (pickle_file,) = cache_dir.glob("*.pkl")
+    pickle_file.write_bytes(b"not a pickle")
+    assert load_tokenizer(wordpiece_path, cache_dir=cache_dir).tokenize("cat") == ["cat"]
+
+
+def test_load_tokenizer_bpe(tmp_path):
+    vocab_path = tmp_path / "vocab.json"
+    merges_path = tmp_path / "merges.txt"
+    vocab_path.write_text(json.dumps(BPE_VOCAB), encoding="utf-8")
+    merges_path.write_text("#version: 0.2\n" + "\n".join(" ".join(m) for m in BPE_MERGES),
+                           encoding="utf-8")
+    tokenizer = load_tokenizer(vocab_path, merges_path, cache_dir=tmp_path / "cache")
+    assert tokenizer.name == "BPE"
+    assert tokenizer.tokenize("lower") == ["low", "er"]
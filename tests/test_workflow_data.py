@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from workflow_data import TransformerData
+
+VOCAB = {"The": 1, "cat": 5, "sits": 8}
+
+
+def test_build_looks_up_ids_and_distinct_rows():
+    data = TransformerData.build("The cat The", VOCAB, seed=3, embedding_dim=4)
+    assert data.tokens == ["The", "cat", "The"]
+    assert data.input_ids == [1, 5, 1]
+    assert data.table_ids == [1, 5]
+    assert data.embeddings.shape == (3, 4)
+    assert (data.embeddings[0] == data.embeddings[2]).all()
+
+
+def test_build_unknown_token_raises():
+    with pytest.raises(ValueError, match="'dog'"):
+        TransformerData.build("The dog", VOCAB)
+
+
+def test_build_unknown_token_uses_unk():
+    data = TransformerData.build("The dog", {**VOCAB, "[UNK]": 0})
+    assert data.input_ids == [1, 0]
+
+
+def test_build_given_tokens_skips_tokenizing():
+    data = TransformerData.build("The cat sits", VOCAB, tokens=["sits"])
+    assert data.tokens == ["sits"]
+    assert data.input_ids == [8]
+
+
+def test_attention_matches_per_head_reference():
+    data = TransformerData.build("The cat sits The", VOCAB, seed=1, embedding_dim=4)
+    attention = data.attention(num_heads=2)
+    x = data.embeddings
+    for head in range(2):
+        columns = slice(head * 2, (head + 1) * 2)
+        q = x @ data.weights["W_q"][:, columns]
+        k = x @ data.weights["W_k"][:, columns]
+        v = x @ data.weights["W_v"][:, columns]
+        scores = q @ k.T / np.sqrt(2)
+        weights = np.exp(scores) / np.exp(scores).sum(axis=1, keepdims=True)
+        np.testing.assert_allclose(attention["Q"][head], q)
+        np.testing.assert_allclose(attention["scores"][head], scores)
+        np.testing.assert_allclose(attention["weights"][head], weights)
+        np.testing.assert_allclose(attention["output"][head], weights @ v)
+    assert attention["weights"].shape == (2, 4, 4)
+    np.testing.assert_allclose(attention["weights"].sum(axis=-1), 1)
+
+
+def test_attention_heads_must_divide_embedding_dim():
+    data = TransformerData.build("The cat", VOCAB, embedding_dim=4)
+    with pytest.raises(ValueError, match="3 heads"):
+        data.attention(num_heads=3)
+
+
+def test_same_seed_gives_identical_arrays():
+    first = TransformerData.build("The cat sits", VOCAB, seed=7, embedding_dim=4)
+    second = TransformerData.build("The cat sits", VOCAB, seed=7, embedding_dim=4)
+    np.testing.assert_array_equal(first.embeddings, second.embeddings)
+    for name, weights in first.weights.items():
+        np.testing.assert_array_equal(weights, second.weights[name])
+
+
+def test_different_seed_changes_arrays():
+    first = TransformerData.build("The cat sits", VOCAB, seed=7, embedding_dim=4)
+    second = TransformerData.build("The cat sits", VOCAB, seed=8, embedding_dim=4)
+    assert not np.array_equal(first.embeddings, second.embeddings)
+    assert not np.array_equal(first.weights["W_q"], second.weights["W_q"])
+
+
+def test_id_row_does_not_depend_on_the_sentence():
+    alone = TransformerData.build("cat", VOCAB, seed=7, embedding_dim=4)
+    in_sentence = TransformerData.build("The sits cat", VOCAB, seed=7, embedding_dim=4)
+    np.testing.assert_array_equal(alone.embeddings[0], in_sentence.embeddings[2])
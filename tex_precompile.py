@@ -0,0 +1,97 @@
+"""Compile many MathTex expressions in a single LaTeX run
+
+manim compiles every distinct tex string on its own (one latex and one
+dvisvgm call each). precompile_tex() writes all the missing expressions into
+one document with one expression per page, converts every page in a single
+dvisvgm call and drops each page's SVG where manim looks for it, so later
+MathTex objects for those strings are served straight from the tex cache.
+The batch is compiled in a private directory and only the finished SVGs are
+moved into the tex cache, so concurrent processes never see partial files.
+"""
+import os
+import re
+import subprocess
+import tempfile
+from pathlib import Path
+
+from manim import config, logger
+from manim.utils.tex_file_writing import generate_tex_file
+
+PAGE_ENVIRONMENT = "manimpage"
+
+
+def precompile_tex(expressions, environment="align*", tex_template=None):
+    """Fill manim's tex cache for every expression in one LaTeX compile
+
+    Expressions are taken as MathTex passes them on, i.e. stripped strings
+    rendered in `environment`. Returns the number of expressions compiled.
+    """
+    tex_template = tex_template or config.tex_template
+
+    missing = {}
+    for expression in dict.fromkeys(str(e).strip() for e in expressions):
+        tex_file = generate_tex_file(expression, environment, tex_template)
+        if not tex_file.with_suffix(".svg").exists():
+            missing[expression] = tex_file
+    if not missing:
+        return 0
+
+    tex_dir = config.get_dir("tex_dir")
+    sources = [tex_file.read_text(encoding="utf-8") for tex_file in missing.values()]
+    batch_source = _batch_document(sources)
+    if batch_source is None:
+        logger.debug("Tex template does not use standalone, skipping batch compile")
+        return 0
+
+    # Inside tex_dir so the final os.replace stays on one filesystem
+    with tempfile.TemporaryDirectory(dir=tex_dir) as work_dir:
+        work_dir = Path(work_dir)
+        batch_file = work_dir / "batch.tex"
+        batch_file.write_text(batch_source, encoding="utf-8")
+
+        output_format = tex_template.output_format
+        subprocess.run(
+            [tex_template.tex_compiler, "-interaction=batchmode", "-halt-on-error",
+             f"-output-directory={work_dir.as_posix()}", batch_file.as_posix()],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        dvisvgm = ["dvisvgm"]
+        if output_format == ".pdf":
+            dvisvgm.append("--pdf")
+        subprocess.run(
+            [*dvisvgm, "-p", "1-", "-n", "-v", "0",
+             "-o", (work_dir / "batch-%p.svg").as_posix(),
+             batch_file.with_suffix(output_format).as_posix()],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+
+        # dvisvgm zero-pads page numbers, so match pages by their numeric value
+        pages = {
+            int(svg.stem.rsplit("-", 1)[1]): svg
+            for svg in work_dir.glob("batch-*.svg")
+        }
+        for page, tex_file in enumerate(missing.values(), start=1):
+            os.replace(pages[page], tex_file.with_suffix(".svg"))
+    return len(missing)
+
+
+def _batch_document(sources):
+    """Merge full single-expression documents into one multi-page document"""
+    preamble, _, _ = sources[0].partition(r"\begin{document}")
+    if "{standalone}" not in preamble:
+        return None
+    preamble = re.sub(
+        r"\\documentclass\[([^\]]*)\]\{standalone\}",
+        lambda match: rf"\documentclass[{match.group(1)},multi]{{standalone}}",
+        preamble,
+    )
+    preamble += (
+        rf"\newenvironment{{{PAGE_ENVIRONMENT}}}{{}}{{}}" "\n"
+        rf"\standaloneenv{{{PAGE_ENVIRONMENT}}}" "\n"
+    )
+
+    pages = []
+    for source in sources:
+        body = source.partition(r"\begin{document}")[2].partition(r"\end{document}")[0]
+        pages.append(rf"\begin{{{PAGE_ENVIRONMENT}}}{body}\end{{{PAGE_ENVIRONMENT}}}")
+    return preamble + "\\begin{document}\n" + "\n".join(pages) + "\n\\end{document}\n"
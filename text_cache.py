@@ -0,0 +1,62 @@
+"""Process-wide cache of prepared Text mobjects
+
+Every Text goes through Pango and SVG parsing, even when the scene has built
+the same label before: token IDs, vocabulary entries and rounded matrix
+values repeat all the time. cached_text() keeps one prepared mobject per
+(text, font, size, color, other Text arguments) and returns copies of it, so
+a repeated label costs a copy instead of a layout. The cache is an LRU
+bounded to maxsize entries and counts hits, misses and evictions. manim is
+only imported to build the first Text.
+"""
+from collections import OrderedDict
+
+
+def build_text(text, **kwargs):
+    from manim import Text
+
+    return Text(text, **kwargs)
+
+
+class TextCache:
+    def __init__(self, maxsize=4096, factory=build_text):
+        self.maxsize = maxsize
+        # Builds the prototype for a missing key, called as factory(text, **kwargs)
+        self.factory = factory
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text, **kwargs):
+        """Return a fresh copy of the Text for these arguments"""
+        # Colors (ManimColor) aren't hashable, so every argument is keyed on its str()
+        key = (text, tuple(sorted((name, str(value)) for name, value in kwargs.items())))
+        prototype = self.entries.get(key)
+        if prototype is None:
+            self.misses += 1
+            prototype = self.factory(text, **kwargs)
+            self.entries[key] = prototype
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        # Callers move and scale what they get, so never hand out the prototype
+        return prototype.copy()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self.entries)}
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+TEXT_CACHE = TextCache()
+
+
+def cached_text(text, **kwargs):
+    """Text(text, **kwargs) through the process-wide cache"""
+    return TEXT_CACHE.get(text, **kwargs)
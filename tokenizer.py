@@ -0,0 +1,223 @@
+"""Subword tokenizers loaded from local vocabulary files
+
+Two formats are supported:
+
+- byte-level BPE (GPT-2 style): vocab.json plus merges.txt
+- WordPiece (BERT style): vocab.txt with one token per line
+
+The parsed index (merge ranks for BPE, a prefix trie for WordPiece) is
+pickled under media/tokenizers/, keyed on the vocabulary files' paths, sizes
+and modification times and on this module's code, so repeated renders skip
+parsing the vocabulary and a changed tokenizer never loads a stale pickle.
+
+Every tokenizer, and the plain vocab_dict lookup of TransformerWorkflow, maps
+tokens to IDs through token_to_id(): a token missing from the vocabulary
+becomes the unknown token's ID, or raises ValueError if there is none.
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+from pathlib import Path
+
+CACHE_DIR = Path("media") / "tokenizers"
+UNK_TOKEN = "[UNK]"
+
+# Pre-tokenization pattern of GPT-2, restricted to what the re module supports
+BPE_PATTERN = re.compile(
+    r"""'s|'t|'re|'ve|'m|'ll|'d| ?[^\W\d_]+| ?\d+| ?[^\s\w]+|\s+(?!\S)|\s+"""
+)
+WORDPIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def token_to_id(vocab, token, unk_token=UNK_TOKEN):
+    """Return token's ID, falling back to unk_token's, or raise ValueError"""
+    token_id = vocab.get(token)
+    if token_id is None and unk_token is not None:
+        token_id = vocab.get(unk_token)
+    if token_id is None:
+        fallback = f" and there is no {unk_token!r} entry" if unk_token is not None else ""
+        raise ValueError(f"Token {token!r} is not in the vocabulary{fallback}")
+    return token_id
+
+
+def bytes_to_unicode():
+    """GPT-2's reversible mapping from bytes to printable unicode characters"""
+    printable = (
+        list(range(ord("!"), ord("~") + 1))
+        + list(range(ord("¡"), ord("¬") + 1))
+        + list(range(ord("®"), ord("ÿ") + 1))
+    )
+    chars = printable[:]
+    extra = 0
+    for byte in range(256):
+        if byte not in printable:
+            printable.append(byte)
+            chars.append(256 + extra)
+            extra += 1
+    return dict(zip(printable, map(chr, chars)))
+
+
+class BPETokenizer:
+    name = "BPE"
+
+    def __init__(self, vocab, merges, unk_token=None):
+        self.vocab = vocab
+        # Byte-level vocabularies cover every byte, so GPT-2 style files have none
+        self.unk_token = unk_token
+        # Merge-rank index: lower rank merges first
+        self.ranks = {pair: rank for rank, pair in enumerate(merges)}
+        self.byte_encoder = bytes_to_unicode()
+        self.word_cache = {}
+
+    @classmethod
+    def from_files(cls, vocab_path, merges_path):
+        vocab = json.loads(Path(vocab_path).read_text(encoding="utf-8"))
+        merges = []
+        for line in Path(merges_path).read_text(encoding="utf-8").splitlines():
+            if line.startswith("#version") or not line.strip():
+                continue
+            merges.append(tuple(line.split()))
+        return cls(vocab, merges)
+
+    def bpe(self, word):
+        """Apply the merges to a single pre-tokenized word"""
+        if word in self.word_cache:
+            return self.word_cache[word]
+        parts = list(word)
+        while len(parts) > 1:
+            pairs = [(self.ranks.get(pair), i) for i, pair in enumerate(zip(parts, parts[1:]))]
+            ranked = [(rank, i) for rank, i in pairs if rank is not None]
+            if not ranked:
+                break
+            _, i = min(ranked)
+            first, second = parts[i], parts[i + 1]
+            # Merge every occurrence of the best pair in one pass
+            merged = []
+            j = 0
+            while j < len(parts):
+                if j < len(parts) - 1 and parts[j] == first and parts[j + 1] == second:
+                    merged.append(first + second)
+                    j += 2
+                else:
+                    merged.append(parts[j])
+                    j += 1
+            parts = merged
+        self.word_cache[word] = parts
+        return parts
+
+    def tokenize(self, text):
+        return list(self.iter_tokens(text))
+
+    def iter_tokens(self, text):
+        """Yield the tokens of text one pre-tokenized word at a time"""
+        for match in BPE_PATTERN.finditer(text):
+            encoded = "".join(self.byte_encoder[b] for b in match.group().encode("utf-8"))
+            yield from self.bpe(encoded)
+
+    def token_to_id(self, token):
+        return token_to_id(self.vocab, token, self.unk_token)
+
+
+class WordPieceTokenizer:
+    name = "WordPiece"
+
+    def __init__(self, vocab, unk_token=UNK_TOKEN, do_lower_case=True, max_chars_per_word=100):
+        self.vocab = vocab
+        self.unk_token = unk_token
+        self.do_lower_case = do_lower_case
+        self.max_chars_per_word = max_chars_per_word
+        # Separate tries for word-initial pieces and "##" continuation pieces
+        self.start_trie = {}
+        self.continuation_trie = {}
+        for token in vocab:
+            if token.startswith("##"):
+                self._insert(self.continuation_trie, token[2:], token)
+            else:
+                self._insert(self.start_trie, token, token)
+
+    @classmethod
+    def from_file(cls, vocab_path, **kwargs):
+        lines = Path(vocab_path).read_text(encoding="utf-8").splitlines()
+        vocab = {token: token_id for token_id, token in enumerate(lines) if token}
+        return cls(vocab, **kwargs)
+
+    @staticmethod
+    def _insert(trie, text, token):
+        node = trie
+        for char in text:
+            node = node.setdefault(char, {})
+        node[None] = token
+
+    @staticmethod
+    def _longest_match(trie, word, start):
+        """Return (token, end) of the longest vocabulary piece at word[start:]"""
+        node = trie
+        match = None
+        for end in range(start, len(word)):
+            node = node.get(word[end])
+            if node is None:
+                break
+            if None in node:
+                match = (node[None], end + 1)
+        return match
+
+    def tokenize(self, text):
+        return list(self.iter_tokens(text))
+
+    def iter_tokens(self, text):
+        """Yield the tokens of text one word at a time"""
+        if self.do_lower_case:
+            text = text.lower()
+        for word_match in WORDPIECE_PATTERN.finditer(text):
+            word = word_match.group()
+            if len(word) > self.max_chars_per_word:
+                yield self.unk_token
+                continue
+            pieces = []
+            start = 0
+            while start < len(word):
+                trie = self.start_trie if start == 0 else self.continuation_trie
+                match = self._longest_match(trie, word, start)
+                if match is None:
+                    pieces = [self.unk_token]
+                    break
+                piece, start = match
+                pieces.append(piece)
+            yield from pieces
+
+    def token_to_id(self, token):
+        return token_to_id(self.vocab, token, self.unk_token)
+
+
+def load_tokenizer(vocab_path, merges_path=None, cache_dir=CACHE_DIR):
+    """Load a BPE (with merges_path) or WordPiece tokenizer, using the on-disk index cache"""
+    paths = [Path(vocab_path)] + ([Path(merges_path)] if merges_path else [])
+    # The pickles hold instances of the classes above, so they are only
+    # valid for the code that wrote them
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    for path in paths:
+        stat = path.stat()
+        digest.update(f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    cache_file = Path(cache_dir) / f"{digest.hexdigest()[:16]}.pkl"
+
+    if cache_file.exists():
+        try:
+            with cache_file.open("rb") as f:
+                return pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError):
+            pass  # Unreadable, parse the vocabulary again and overwrite it
+
+    if merges_path:
+        tokenizer = BPETokenizer.from_files(vocab_path, merges_path)
+    else:
+        tokenizer = WordPieceTokenizer.from_file(vocab_path)
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    # Per process, so workers sharing the cache never write the same file
+    tmp_file = cache_file.with_name(f"{cache_file.stem}.{os.getpid()}.tmp")
+    with tmp_file.open("wb") as f:
+        pickle.dump(tokenizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_file.replace(cache_file)
+    return tokenizer
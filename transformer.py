@@ -1,25 +1,64 @@
+import itertools
+import math
+import re
+from pathlib import Path
+
 from manim import *
 import numpy as np
 
+from arrow_bundle import ArrowBundle
+from background import BackgroundCacheScene
+from heatmap import MatrixHeatmap
+from highlights import HighlightPool
+from text_cache import cached_text
+from tokenizer import load_tokenizer
+from workflow_data import TransformerData
+
+# Step 4 regions: the embedding table on the left, under its title, and the
+# output vectors on the right, under the ID boxes; the summary goes below both
+EMBEDDING_TABLE_X = -3.8
+EMBEDDING_TABLE_TOP = 1.1
+EMBEDDING_TABLE_WIDTH = 3.8
+EMBEDDING_TABLE_HEIGHT = 4
+EMBEDDING_VECTORS_X = 2.6
+EMBEDDING_VECTORS_TOP = 0.3
+EMBEDDING_VECTORS_WIDTH = 8
+
 class VocabularyComponent:
-    def __init__(self, vocab_dict, position=ORIGIN):
+    def __init__(self, vocab_dict, position=ORIGIN, window_size=None, margin=4, entry_width=3):
         self.vocab_dict = vocab_dict
         self.position = position
         self.token_mobjects = {}  # Store reference to each token's mobject
         self.vocab_group = None
+        # With a window_size only that many entries are on screen at once.
+        # They live in fixed slots whose contents are swapped as the window
+        # jumps, and entry mobjects are built lazily, so the mobject count
+        # does not depend on the size of the vocabulary
+        self.window_size = window_size
+        self.margin = margin
+        self.entry_width = entry_width
+        self.window_start = 0
+        self.slots = []
+        self.entry_cache = {}  # row -> prepared entry mobject, near the window only
+        self.window_label = None
+        if window_size is not None:
+            self.tokens = list(vocab_dict)
+            self.rows = {token: row for row, token in enumerate(self.tokens)}
         
     def animate_in(self, scene):
         """Create and return animations to show the vocabulary"""
+        if self.window_size is not None:
+            return self.animate_in_windowed(scene)
+
         vocab_items = []
         
         # Create title
-        vocab_title = Text("Vocabulary Dictionary", font_size=24, color=BLUE)
-        vocab_title.move_to(self.position + UP * 2.3)
+        vocab_title = self.build_title()
         
         # Create vocabulary entries
         y_offset = 1.5
         for token, token_id in self.vocab_dict.items():
-            entry_text = Text(f'"{token}": {token_id}', font_size=18, color=WHITE)
+            entry_text = cached_text(f'"{token}": {token_id}', font_size=18, color=WHITE)
             entry_text.move_to(self.position + UP * y_offset)
             
             # Store reference to this token's mobject
@@ -37,9 +76,88 @@ class VocabularyComponent:
         self.vocab_group = VGroup(vocab_title, vocab_box, *vocab_items)
         
         return [Write(vocab_title), Create(vocab_box), *[Write(item) for item in vocab_items]]
+
+    def animate_in_windowed(self, scene):
+        """Show a window of window_size entries inside a fixed-size box"""
+        vocab_title = self.build_title()
+        visible = min(self.window_size, len(self.tokens))
+        # Slots are copies, so recycling them never touches the cached entries
+        self.slots = [self.build_entry(row).copy() for row in range(visible)]
+
+        vocab_box = Rectangle(width=self.entry_width, height=0.4 * visible, color=BLUE)
+        vocab_box.move_to(self.position + UP * (1.5 - 0.2 * (visible - 1)))
+        vocab_box.stretch_to_fit_height(vocab_box.height + 0.3)
+        self.window_label = self.build_window_label()
+        self.window_label.next_to(vocab_box, DOWN, buff=0.15)
+
+        self.vocab_group = VGroup(vocab_title, vocab_box, *self.slots, self.window_label)
+        return [Write(vocab_title), Create(vocab_box), *[Write(slot) for slot in self.slots],
+                FadeIn(self.window_label)]
+
+    def build_title(self):
+        vocab_title = Text("Vocabulary Dictionary", font_size=24, color=BLUE)
+        return vocab_title.move_to(self.position + UP * 2.3)
+
+    def build_entry(self, row, slot=None):
+        """Return the entry mobject for a vocabulary row, placed in its window slot"""
+        entry_text = self.entry_cache.get(row)
+        if entry_text is None:
+            token = self.tokens[row]
+            entry_text = cached_text(f'"{token}": {self.vocab_dict[token]}', font_size=18, color=WHITE)
+            if entry_text.width > self.entry_width - 0.2:
+                entry_text.scale_to_fit_width(self.entry_width - 0.2)
+            self.entry_cache[row] = entry_text
+        slot = row - self.window_start if slot is None else slot
+        return entry_text.move_to(self.position + UP * (1.5 - 0.4 * slot))
+
+    def build_window_label(self):
+        end = self.window_start + len(self.slots)
+        label = f"{self.window_start + 1}-{end} of {len(self.tokens)}"
+        return Text(label, font_size=14, color=GRAY)
+
+    def window_start_for(self, row, start):
+        """Return where the window starts after jumping to row from start"""
+        visible = len(self.slots)
+        if start <= row < start + visible:
+            return start
+        return max(0, min(row - visible // 2, len(self.tokens) - visible))
+
+    def jump_to_row(self, row):
+        """Move the window so that row is visible, recycling the slot mobjects"""
+        self.set_window_start(self.window_start_for(row, self.window_start))
+
+    def set_window_start(self, start):
+        if start == self.window_start:
+            return
+        self.window_start = start
+        visible = len(self.slots)
+        for slot_index, slot in enumerate(self.slots):
+            slot.become(self.build_entry(self.window_start + slot_index, slot_index))
+
+        # Only keep prepared entries within the margin around the window
+        low = self.window_start - self.margin
+        high = self.window_start + visible + self.margin
+        self.entry_cache = {
+            row: entry for row, entry in self.entry_cache.items() if low <= row < high
+        }
+        label = self.build_window_label().move_to(self.window_label)
+        self.window_label.become(label)
+
+    def needs_jump(self, token):
+        """Return whether looking token up moves the window"""
+        row = self.rows.get(token) if self.window_size is not None else None
+        if row is None or not self.slots:
+            return False
+        return self.window_start_for(row, self.window_start) != self.window_start
     
     def get_token_mobject(self, token):
         """Return the mobject representing the token in the vocabulary display"""
+        if self.window_size is not None:
+            row = self.rows.get(token)
+            if row is None or not self.slots:
+                return None
+            self.jump_to_row(row)
+            return self.slots[row - self.window_start]
         return self.token_mobjects.get(token, None)
     
     def get_entry_position(self, token):
@@ -52,41 +170,417 @@ class VocabularyComponent:
 
 
 
-class TransformerWorkflow(Scene):
+class TransformerWorkflow(BackgroundCacheScene, Scene):
+    # Steps played by construct, in order. Each step is also a self-contained
+    # segment: restore_state() rebuilds what is on screen at its entry, so it
+    # can be rendered on its own (see segments.py)
+    steps = [
+        "step_1_input_sentence",
+        "step_2_tokenization",
+        "step_3_input_ids",
+        "step_4_input_embeddings",
+    ]
+    step_titles = {
+        "step_1_input_sentence": "Step 1: Input Sentence",
+        "step_2_tokenization": "Step 2: Tokenization (Word-level)",
+        "step_3_input_ids": "Step 3: Token to Input IDs (Vocabulary Lookup)",
+        "step_4_input_embeddings": "Step 4: Input IDs to Embeddings",
+    }
+    # Pause held at the end of each step
+    step_waits = {
+        "step_1_input_sentence": 2,
+        "step_2_tokenization": 2,
+        "step_3_input_ids": 2,
+        "step_4_input_embeddings": 3,
+    }
+    # Attributes that make up the serializable state at a step boundary
+    state_keys = ["sentence", "tokens", "token_offset", "input_ids"]
+
+    sentence = " The cat sits on a mat "
+    # Small vocabulary dictionary used for the lookup in step 3
+    vocab_dict = {
+        "The": 1,
+        "cat": 5,
+        "sits": 8,
+        "dog": 3,
+        "runs": 7,
+        "sleeps": 9,
+        "on": 2,
+        "a": 4,
+        "mat": 6
+    }
+    # Optional subword vocabulary from local files: vocab.json plus merges.txt
+    # for BPE, or a WordPiece vocab.txt. When set it replaces sentence.split()
+    # in step 2 and vocab_dict in step 3
+    vocab_path = None
+    merges_path = None
+    # Optional embedding table for step 4: a .npy file, or a raw row-major
+    # dump with embedding_shape. It is memory-mapped and only the rows of
+    # the input IDs are read. Without it, rows of embedding_dim are drawn
+    # from a generator seeded with (seed, ID)
+    embedding_path = None
+    embedding_shape = None
+    embedding_dim = 4
+    # Embeddings up to this wide are drawn cell by cell; wider ones as heatmaps
+    embedding_display_dim = 4
+    # Seed for every generated number (embeddings, weights)
+    seed = 0
+    # Scale applied to the tokenization group (and ID boxes) in step 3; a
+    # paged layout is shrunk further until it and its ID grid fit
+    scale_factor = 0.8
+    # Vocabularies larger than this are shown through a scrolling window
+    vocab_window_size = 12
+    # "step" plays each token's lookup stage by stage; "pipelined" builds all
+    # lookups into one timeline where adjacent tokens overlap by lag_ratio
+    lookup_mode = "step"
+    lookup_lag_ratio = 0.3
+    lookup_stage_time = 0.5
+    # Move one persistent set of lookup highlights and arrows from token to
+    # token instead of creating and fading out a new set for every token
+    reuse_highlights = False
+    # Fan-out arrows for more tokens than this are drawn as one ArrowBundle
+    arrow_bundle_threshold = 16
+    # "row" lays every token out on one row; "paged" streams the tokens from a
+    # generator into pages of wrapped rows, keeping only the current page's
+    # mobjects, and later steps continue with the last page
+    token_layout = "row"
+    tokens_per_row = 8
+    rows_per_page = 4
+    # Longer sentences are shortened with an ellipsis in step 1's box
+    sentence_preview_chars = 80
+    # Index in the sequence of the first token on screen (non-zero when paged)
+    token_offset = 0
+
+    def setup(self):
+        super().setup()
+        self.tokenizer = None
+        if self.vocab_path:
+            self.tokenizer = load_tokenizer(self.vocab_path, self.merges_path)
+            self.vocab_dict = self.tokenizer.vocab
+        # Everything the steps show is computed here, once, from the seed. A
+        # paged layout only ever computes the page on screen (in step 2, or
+        # in restore_state), so memory doesn't grow with the sentence
+        self.data = None if self.token_layout == "paged" else self.build_data()
+
     def construct(self):
-        # Title
+        self.show_title()
+        for step in self.steps:
+            self.play_step(step)
+
+    def show_title(self):
+        """Show and dismiss the workflow title"""
         title = Text("Transformer Architecture: Input Processing Workflow", 
                     font_size=36, color=BLUE)
         self.play(Write(title))
         # self.play(title.animate.to_edge(UP))
         self.play(FadeOut(title))
+
+    def play_step(self, step):
+        """Run one step followed by its pause"""
+        getattr(self, step)()
+        self.completed_steps = self.get_completed_steps() + [step]
+        self.wait(self.step_waits[step])
+
+    def get_completed_steps(self):
+        return list(getattr(self, "completed_steps", []))
+
+    def get_state(self):
+        """Return a JSON-serializable snapshot of the workflow at the current step boundary"""
+        state = {"completed": self.get_completed_steps()}
+        for key in self.state_keys:
+            if key in self.__dict__:
+                state[key] = self.__dict__[key]
+        return state
+
+    @classmethod
+    def step_params(cls):
+        """Return every class-level data attribute outside manim, for cache keys
+
+        Taken from the whole MRO, so attributes set on a subclass (a batch
+        job, a benchmark case) count as much as the defaults here.
+        """
+        params = {}
+        for klass in reversed(cls.__mro__):
+            if klass is object or klass.__module__.startswith("manim"):
+                continue
+            for key, value in vars(klass).items():
+                if key.startswith("__") or callable(value) or isinstance(value, (classmethod, staticmethod, property)):
+                    continue
+                params[key] = value
+        # Files are keyed on their path, size and modification time
+        for key in ("vocab_path", "merges_path", "embedding_path"):
+            if params.get(key):
+                path = Path(params[key])
+                stat = path.stat()
+                params[key] = [str(path.resolve()), stat.st_size, stat.st_mtime_ns]
+        return params
+
+    def restore_state(self, state):
+        """Rebuild, without animating, what is on screen once state["completed"] have run"""
+        for key in self.state_keys:
+            if key in state:
+                setattr(self, key, state[key])
+        completed = state["completed"]
+        self.completed_steps = list(completed)
+        if not completed:
+            return
+
+        # Later steps keep transforming the step 1 title in place
+        self.step1_title = self.build_step_title(completed[-1])
+        self.add(self.step1_title)
+
+        self.sentence_group = self.build_sentence_group(self.sentence)
+        if "step_2_tokenization" not in completed:
+            self.add(*self.sentence_group)
+            return
+
+        self.sentence_group.move_to(UP * 2.3)
+        if self.token_layout == "paged":
+            self.data = self.build_data(self.tokens)
+        self.token_boxes, self.token_texts = self.build_token_layout(self.tokens)
+        arrows = self.build_token_arrows(self.sentence_group, self.token_boxes)
+        self.tokenization_group = VGroup(*self.token_boxes, *self.token_texts, self.sentence_group, arrows)
+        self.add(*self.sentence_group, *arrows, *self.token_boxes, *self.token_texts)
+        if self.token_layout == "paged":
+            page_label = self.build_page_label(self.token_offset, len(self.tokens))
+            self.tokenization_group.add(page_label)
+            self.add(page_label)
+        if "step_3_input_ids" not in completed:
+            return
+
+        self.lookup_scale = self.get_lookup_scale()
+        self.place_tokenization_group(self.tokenization_group)
+        vocab_component = self.build_vocab_component()
+        vocab_component.animate_in(self)
+        self.add(*vocab_component.vocab_group)
+        # Leave the vocabulary window where the last lookup moved it
+        for token in self.tokens:
+            vocab_component.get_token_mobject(token)
+
+        self.id_boxes, _ = self.build_id_layout(self.token_boxes)
+        lookup_arrows = self.build_lookup_arrows(self.token_boxes, self.id_boxes)
+        self.id_texts = [
+            self.build_id_text(token_id, id_box)
+            for token_id, id_box in zip(self.input_ids, self.id_boxes)
+        ]
+        ids_label = self.build_ids_label(self.input_ids)
+        final_arrows = self.build_final_arrows(self.id_boxes, ids_label)
+        self.add(*lookup_arrows, *self.id_boxes, *self.id_texts, *final_arrows, ids_label)
+        self.ids_group = VGroup(*self.id_boxes, *self.id_texts)
+        self.freeze(self.tokenization_group, vocab_component.vocab_group, *lookup_arrows, *self.id_boxes)
+
+    def build_data(self, tokens=None):
+        """Compute the data for tokens (by default every token of the sentence)"""
+        return TransformerData.build(
+            self.sentence, self.vocab_dict, tokens=tokens, tokenizer=self.tokenizer, seed=self.seed,
+            embedding_path=self.embedding_path, embedding_shape=self.embedding_shape,
+            embedding_dim=self.embedding_dim,
+        )
+
+    def build_step_title(self, step):
+        text = self.step_titles[step]
+        if step == "step_2_tokenization" and self.tokenizer is not None:
+            text = f"Step 2: Tokenization ({self.tokenizer.name})"
+        title = Text(text, font_size=28, color=GREEN)
+        return title.to_edge(LEFT + UP)
+
+    def get_lookup_scale(self):
+        """Return the scale step 3 shrinks the tokenization group by (the ID boxes follow it)"""
+        if self.token_layout != "paged":
+            return self.scale_factor
+        # The page and an ID grid with as many rows must both fit left of the vocabulary
+        rows = -(-len(self.tokens) // self.tokens_per_row)
+        grid_height = max(rows - 1, 0) * 0.8 + 0.6
+        group = self.tokenization_group
+        return min(self.scale_factor, 4.8 / (group.height + 0.3 + grid_height), 10 / group.width)
+
+    def place_tokenization_group(self, group):
+        """Shrink and move the tokenization group (or its .animate) to its place in step 3"""
+        group = group.scale(self.lookup_scale)
+        if self.token_layout == "paged":
+            return group.move_to(LEFT * 2).to_edge(UP, buff=1)
+        return group.move_to(LEFT * 2 + UP * 1.5)
+
+    def build_vocab_component(self):
+        window_size = None
+        if len(self.vocab_dict) > self.vocab_window_size:
+            window_size = self.vocab_window_size
+        return VocabularyComponent(self.vocab_dict, position=RIGHT * 5, window_size=window_size)
+
+    def build_sentence_group(self, sentence):
+        sentence_box = Rectangle(width=6, height=1, color=YELLOW, fill_opacity=0.2)
+        if len(sentence) > self.sentence_preview_chars:
+            sentence = sentence[:self.sentence_preview_chars - 1].rstrip() + "…"
+        sentence_text = Text(f'"{sentence}"', font_size=24, color=WHITE)
+        if sentence_text.width > sentence_box.width - 0.4:
+            sentence_text.scale_to_fit_width(sentence_box.width - 0.4)
+        return VGroup(sentence_box, sentence_text).move_to(UP * 1)
+
+    def iter_tokens(self):
+        """Yield the sentence's tokens lazily, split the same way TransformerData.build does"""
+        if self.tokenizer is not None:
+            return self.tokenizer.iter_tokens(self.sentence)
+        return (match.group() for match in re.finditer(r"\S+", self.sentence))
+
+    def build_token_layout(self, tokens):
+        if self.token_layout == "paged":
+            return self.build_token_page(tokens)
+        token_boxes = []
+        token_texts = []
         
-        # Step 1: Input Sentence
-        self.step_1_input_sentence()
-        self.wait(2)
-        
-        # Step 2: Tokenization
-        self.step_2_tokenization()
-        self.wait(2)
-        
-        # Step 3: Input IDs
-        self.step_3_input_ids()
-        self.wait(2)
-        
-        # # Step 4: Input Embeddings
-        # self.step_4_input_embeddings()
-        # self.wait(3)
+        for i, token in enumerate(tokens):
+            # Position tokens horizontally
+            x_pos = (i - len(tokens)/2 + 0.5) * 2
+            
+            token_box = Rectangle(width=1.5, height=0.8, 
+                                color=ORANGE, fill_opacity=0.3)
+            token_box.move_to(RIGHT * x_pos)
+            
+            token_text = cached_text(f'{token}', font_size=20, color=WHITE)
+            token_text.move_to(token_box.get_center())
+            
+            token_boxes.append(token_box)
+            token_texts.append(token_text)
+        return token_boxes, token_texts
+
+    def build_token_page(self, tokens):
+        """Lay out one page of tokens in rows of tokens_per_row below the sentence"""
+        per_row = self.tokens_per_row
+        stride = (config.frame_width - 1) / per_row
+        rows, cols = np.divmod(np.arange(len(tokens)), per_row)
+        n_cols = min(len(tokens), per_row)
+        positions = np.zeros((len(tokens), 3))
+        positions[:, 0] = (cols - (n_cols - 1) / 2) * stride
+        positions[:, 1] = 0.5 - rows * 0.8
         
+        token_boxes = []
+        token_texts = []
+        for token, position in zip(tokens, positions):
+            token_box = Rectangle(width=stride * 0.85, height=0.6,
+                                color=ORANGE, fill_opacity=0.3)
+            token_box.move_to(position)
+            
+            token_text = cached_text(f'{token}', font_size=20, color=WHITE)
+            if token_text.width > token_box.width - 0.1:
+                token_text.scale_to_fit_width(token_box.width - 0.1)
+            token_text.move_to(position)
+            
+            token_boxes.append(token_box)
+            token_texts.append(token_text)
+        return token_boxes, token_texts
+
+    def build_page_label(self, offset, count):
+        label = Text(f"Tokens {offset + 1}-{offset + count}", font_size=16, color=GRAY)
+        # Just below the last row of a full page
+        return label.move_to(DOWN * (self.rows_per_page * 0.8 - 0.75))
+
+    def build_arrows(self, starts, ends, **kwargs):
+        """Return one Arrow per start/end pair, or a single ArrowBundle above the threshold"""
+        if len(starts) > self.arrow_bundle_threshold:
+            return [ArrowBundle(starts, ends, **kwargs)]
+        return [Arrow(start=start, end=end, **kwargs) for start, end in zip(starts, ends)]
+
+    def grow_arrows(self, arrows):
+        return [arrow.grow() if isinstance(arrow, ArrowBundle) else GrowArrow(arrow)
+                for arrow in arrows]
+
+    def build_token_arrows(self, sentence_group, token_boxes):
+        """Fan arrows out from the bottom of the sentence box to the token boxes"""
+        ends = [box.get_top() for box in token_boxes]
+        if self.token_layout != "paged":
+            starts = [sentence_group.get_bottom() + RIGHT * (i - 1) * 0.5 for i in range(len(token_boxes))]
+            return self.build_arrows(starts, ends, color=BLUE, stroke_width=3)
+        sentence_box = sentence_group[0]
+        count = len(token_boxes)
+        spacing = min(0.5, (sentence_box.width - 0.4) / max(count - 1, 1))
+        # Starts are handed out left to right column by column, so the arrows
+        # into wrapped rows stay within the box and don't cross each other
+        order = sorted(range(count), key=lambda i: (round(token_boxes[i].get_x(), 2), -token_boxes[i].get_y()))
+        starts = [None] * count
+        for rank, i in enumerate(order):
+            starts[i] = sentence_box.get_bottom() + RIGHT * (rank - (count - 1) / 2) * spacing
+        return self.build_arrows(starts, ends, color=BLUE, stroke_width=3)
+
+    def get_token_rows(self, count):
+        """Return the row of the page grid each of count tokens sits in"""
+        if self.token_layout == "paged":
+            return [i // self.tokens_per_row for i in range(count)]
+        return [0] * count
+
+    def build_id_layout(self, token_boxes):
+        """Return empty ID boxes on the token boxes' columns and rows, below them"""
+        scale = self.lookup_scale
+        if not token_boxes:
+            return [], []
+        rows = self.get_token_rows(len(token_boxes))
+        if self.token_layout == "paged":
+            top = self.tokenization_group.get_bottom()[1] - 0.3 * scale - token_boxes[0].height / 2
+        else:
+            top = -1
+        id_boxes = []
+        id_texts = []
+        for token_box, row in zip(token_boxes, rows):
+            id_box = Rectangle(
+                width=min(1.2 * scale, token_box.width), 
+                height=token_box.height, 
+                color=RED, 
+                fill_opacity=0.3
+            )
+            id_box.move_to([token_box.get_x(), top - row * 0.8 * scale, 0])
+            
+            # Create empty text initially
+            id_text = cached_text("", font_size=int(24 * scale), color=WHITE)
+            id_text.move_to(id_box.get_center())
+            
+            id_boxes.append(id_box)
+            id_texts.append(id_text)
+        return id_boxes, id_texts
+
+    def build_id_text(self, token_id, id_box):
+        id_text = cached_text(str(token_id), font_size=int(24 * self.lookup_scale), color=WHITE)
+        return id_text.move_to(id_box.get_center())
+
+    def build_lookup_arrows(self, token_boxes, id_boxes):
+        # Arrows from upper rows of a page pass the rows below; shifting each
+        # row's arrows sideways keeps a column's arrows from overlapping
+        rows = self.get_token_rows(len(token_boxes))
+        n_rows = max(rows, default=0) + 1
+        shifts = [
+            RIGHT * (row - (n_rows - 1) / 2) * token_box.width / (n_rows + 1)
+            for row, token_box in zip(rows, token_boxes)
+        ]
+        return self.build_arrows(
+            [token_box.get_bottom() + DOWN * 0.1 + shift for token_box, shift in zip(token_boxes, shifts)],  # Add small buffer
+            [id_box.get_top() + UP * 0.1 + shift for id_box, shift in zip(id_boxes, shifts)],
+            color=GREEN,
+            stroke_width=3 * self.lookup_scale,
+            buff=0.1  # Minimum arrow length
+        )
+
+    def build_ids_label(self, input_ids):
+        ids_label_str = '[' + ', '.join(str(i) for i in input_ids) + ']'
+        ids_label = Text(f"{ids_label_str}", font_size=int(30 * self.lookup_scale), color=RED)
+        if ids_label.width > 10:
+            ids_label.scale_to_fit_width(10)
+        return ids_label.move_to(LEFT * 2 + DOWN * 3)
+
+    def build_final_arrows(self, id_boxes, ids_label):
+        return self.build_arrows(
+            [id_box.get_bottom() for id_box in id_boxes],
+            [ids_label.get_top()] * len(id_boxes),
+            color=YELLOW_B,
+            stroke_width=3 * self.lookup_scale
+        )
+
     def step_1_input_sentence(self):
         """Step 1: Show the input sentence"""
-        step1_title = Text("Step 1: Input Sentence", font_size=28, color=GREEN).to_edge(LEFT + UP)
+        step1_title = self.build_step_title("step_1_input_sentence")
         self.play(Write(step1_title))
         
         # Input sentence
-        sentence = " The cat sits on a mat "
-        sentence_box = Rectangle(width=6, height=1, color=YELLOW, fill_opacity=0.2)
-        sentence_text = Text(f'"{sentence}"', font_size=24, color=WHITE)
-        sentence_group = VGroup(sentence_box, sentence_text).move_to(UP * 1)
+        sentence = self.sentence
+        sentence_group = self.build_sentence_group(sentence)
+        sentence_box, sentence_text = sentence_group
         
         self.play(DrawBorderThenFill(sentence_box), Write(sentence_text))
         
@@ -97,33 +591,21 @@ class TransformerWorkflow(Scene):
         
     def step_2_tokenization(self):
         """Step 2: Break sentence into individual words (tokens)"""
-        step2_title = Text("Step 2: Tokenization (Word-level)", 
-                          font_size=28, color=GREEN).to_edge(LEFT + UP)
+        step2_title = self.build_step_title("step_2_tokenization")
         
         # Fade out step 1 title and bring in step 2
         self.play(
             Transform(self.step1_title, step2_title)
         )
+        if self.token_layout == "paged":
+            self.play(self.sentence_group.animate.move_to(UP * 2.3))
+            self.play_token_pages()
+            return
         # Tokenize the sentence
-        tokens = self.sentence.split()
+        tokens = self.data.tokens
         
         # Create individual token boxes
-        token_boxes = []
-        token_texts = []
-        
-        for i, token in enumerate(tokens):
-            # Position tokens horizontally
-            x_pos = (i - len(tokens)/2 + 0.5) * 2
-            
-            token_box = Rectangle(width=1.5, height=0.8, 
-                                color=ORANGE, fill_opacity=0.3)
-            token_box.move_to(RIGHT * x_pos)
-            
-            token_text = Text(f'{token}', font_size=20, color=WHITE)
-            token_text.move_to(token_box.get_center())
-            
-            token_boxes.append(token_box)
-            token_texts.append(token_text)
+        token_boxes, token_texts = self.build_token_layout(tokens)
         
         # Animate the transformation from sentence to tokens
         self.play(
@@ -132,239 +614,392 @@ class TransformerWorkflow(Scene):
         )
         
         # Add arrows showing the breakdown
-        arrows = []
-        for i, box in enumerate(token_boxes):
-            arrow = Arrow(start=self.sentence_group.get_bottom() + RIGHT * (i - 1) * 0.5,
-                         end=box.get_top(), color=BLUE, stroke_width=3)
-            arrows.append(arrow)
+        arrows = self.build_token_arrows(self.sentence_group, token_boxes)
         
-        self.play(*[GrowArrow(arrow) for arrow in arrows],
+        self.play(*self.grow_arrows(arrows),
                   *[DrawBorderThenFill(box) for box in token_boxes],
                   *[Write(text) for text in token_texts])
         
         # Store for next step
         self.tokens = tokens
+        self.token_offset = 0
         self.token_boxes = token_boxes
         self.token_texts = token_texts
         self.tokenization_group = VGroup(*token_boxes, *token_texts, self.sentence_group,arrows)
         
+    def play_token_pages(self):
+        """Stream the tokens onto the screen one page at a time"""
+        page_size = self.tokens_per_row * self.rows_per_page
+        tokens = self.iter_tokens()
+        offset = 0
+        page = []
+        token_boxes, token_texts, arrows, page_label = [], [], [], VGroup()
+        previous = None
+        while True:
+            next_page = list(itertools.islice(tokens, page_size))
+            if not next_page:
+                break
+            if page:
+                offset += len(page)
+            page = next_page
+            token_boxes, token_texts = self.build_token_layout(page)
+            arrows = self.build_token_arrows(self.sentence_group, token_boxes)
+            page_label = self.build_page_label(offset, len(page))
+            if previous is not None:
+                # Scroll the old page out; once removed nothing refers to its
+                # mobjects, so only one page is ever held in memory
+                self.play(FadeOut(previous, shift=UP * 0.5))
+            self.play(*self.grow_arrows(arrows),
+                      *[DrawBorderThenFill(box) for box in token_boxes],
+                      *[Write(text) for text in token_texts],
+                      FadeIn(page_label))
+            previous = VGroup(*token_boxes, *token_texts, *arrows, page_label)
+        
+        # Later steps continue with the last page, the only one computed
+        self.data = self.build_data(page)
+        self.tokens = page
+        self.token_offset = offset
+        self.token_boxes = token_boxes
+        self.token_texts = token_texts
+        self.tokenization_group = VGroup(*token_boxes, *token_texts, self.sentence_group, arrows, page_label)
+        
     def step_3_input_ids(self):
         """Step 3: Convert tokens to input IDs using vocabulary"""
-        step3_title = Text("Step 3: Token to Input IDs (Vocabulary Lookup)", 
-                        font_size=28, color=GREEN).to_edge(LEFT + UP)
+        step3_title = self.build_step_title("step_3_input_ids")
         
         self.play(Transform(self.step1_title, step3_title))
         
-        # Create a small vocabulary dictionary
-        vocab_dict = {
-            "The": 1,
-            "cat": 5,
-            "sits": 8,
-            "dog": 3,
-            "runs": 7,
-            "sleeps": 9,
-            "on": 2,
-            "a": 4,
-            "mat": 6
-        }
-        
+        self.lookup_scale = self.get_lookup_scale()
         self.play(
-            self.tokenization_group.animate.scale(0.8).move_to(LEFT * 2 + UP * 1.5),
+            self.place_tokenization_group(self.tokenization_group.animate),
         )
-        vocab_component = VocabularyComponent(vocab_dict, position=RIGHT * 5)
+        vocab_component = self.build_vocab_component()
         self.play(*vocab_component.animate_in(self))
         
-        # Create input ID boxes (initially empty)
-        input_ids = []
-        id_boxes = []
-        id_texts = []
+        # Pre-create all ID boxes (empty initially)
+        id_boxes, id_texts = self.build_id_layout(self.token_boxes)
         
-        # Use the same scale factor as tokenization group
-        scale_factor = 0.8
+        # Create arrows with scaled stroke width
+        lookup_arrows = self.build_lookup_arrows(self.token_boxes, id_boxes)
+        # Draw all empty ID boxes
+        self.play(
+            *self.grow_arrows(lookup_arrows),
+            *[DrawBorderThenFill(box) for box in id_boxes]
+        )
+        # None of this moves again during the lookups, so it is drawn once
+        # into the background layer instead of on every play
+        self.freeze(self.tokenization_group, vocab_component.vocab_group, *lookup_arrows, *id_boxes)
         
-        # Pre-create all ID boxes (empty initially)
-        for i, token in enumerate(self.tokens):
-            x_pos = (i - len(self.tokens)/2 + 0.5) * 2 * scale_factor
-            
-            id_box = Rectangle(
-                width=1.2 * scale_factor, 
-                height=0.8 * scale_factor, 
-                color=RED, 
-                fill_opacity=0.3
-            )
-            id_box.move_to(LEFT * 2 + RIGHT * x_pos + DOWN * 1)
-            
-            # Create empty text initially
-            id_text = Text("", font_size=int(24 * scale_factor), color=WHITE)
-            id_text.move_to(id_box.get_center())
-            
-            id_boxes.append(id_box)
-            id_texts.append(id_text)
+        # Now animate each token-to-ID mapping
+        if self.lookup_mode == "pipelined":
+            input_ids = self.play_lookups_pipelined(vocab_component, id_boxes, id_texts)
+        else:
+            input_ids = self.play_lookups(vocab_component, id_boxes, id_texts)
         
+        # Final step: Show the complete input IDs array
+        ids_label = self.build_ids_label(input_ids)
         
-         # Create arrows with scaled stroke width
-        # Create arrows with scaled stroke width
-        lookup_arrows = []  
-        for i, (token_box, id_box) in enumerate(zip(self.token_boxes, id_boxes)):   
-            arrow = Arrow(
-            start=token_box.get_bottom() + DOWN * 0.1,  # Add small buffer
-            end=id_box.get_top() + UP * 0.1, 
-            color=GREEN, 
-            stroke_width=3 * scale_factor,
-            buff=0.1  # Minimum arrow length
+        final_arrows = self.build_final_arrows(id_boxes, ids_label)
+        
+        # First animate the arrows
+        self.play(
+            *self.grow_arrows(final_arrows)
         )
 
-            lookup_arrows.append(arrow)
-        # Draw all empty ID boxes
+        # Then display the ids_label
         self.play(
-            *[GrowArrow(arrow) for arrow in lookup_arrows],
-            *[DrawBorderThenFill(box) for box in id_boxes]
+            Write(ids_label)
         )
+
+
+                
+        
+        # Store for next step
+        self.input_ids = input_ids
+        self.id_boxes = id_boxes
+        self.id_texts = id_texts
+        self.ids_group = VGroup(*id_boxes, *id_texts)
+        
+    def play_lookups(self, vocab_component, id_boxes, id_texts):
+        """Animate each token-to-ID mapping one by one"""
+        scale_factor = self.lookup_scale
+        input_ids = []
+        highlights = HighlightPool(reuse=self.reuse_highlights)
         
-        # Now animate each token-to-ID mapping one by one
         for i, token in enumerate(self.tokens):
-            token_id = vocab_dict[token]
+            token_id = self.data.input_ids[i]
             input_ids.append(token_id)
-            
+        
             # 1. Highlight the current token box
-            token_highlight = SurroundingRectangle(
+            self.play(highlights.surround(
+                "token",
                 self.token_boxes[i], 
                 color=YELLOW, 
                 stroke_width=4,
                 buff=0.1
-            )
-            self.play(Create(token_highlight))
-            
+            ))
+        
             # 2. Get vocabulary entry and highlight it
             vocab_entry_mobject = vocab_component.get_token_mobject(token)
             if vocab_entry_mobject:  # Check if mobject exists
-                vocab_highlight = SurroundingRectangle(
+                self.play(highlights.surround(
+                    "vocab",
                     vocab_entry_mobject, 
                     color=ORANGE, 
                     stroke_width=3
-                )
-                self.play(Create(vocab_highlight))
-                
+                ))
+            
                 # 3. Show lookup arrow from token to vocab
-                lookup_arrow = Arrow(
-                    start=self.token_boxes[i].get_right(),
-                    end=vocab_entry_mobject.get_left(),
+                self.play(highlights.arrow(
+                    "lookup",
+                    self.token_boxes[i].get_right(),
+                    vocab_entry_mobject.get_left(),
                     color=GREEN, 
                     stroke_width=3 * scale_factor
-                )
-                self.play(GrowArrow(lookup_arrow))
-                
+                ))
+            
                 # 4. Show mapping arrow from vocab to ID box
-                mapping_arrow = Arrow(
-                    start=vocab_entry_mobject.get_bottom(),
-                    end=id_boxes[i].get_top(), 
+                self.play(highlights.arrow(
+                    "mapping",
+                    vocab_entry_mobject.get_bottom(),
+                    id_boxes[i].get_top(), 
                     color=BLUE, 
                     stroke_width=3 * scale_factor
-                )
-                self.play(GrowArrow(mapping_arrow))
-                
+                ))
+            
                 # 5. Populate the ID box with the value
-                new_id_text = Text(str(token_id), font_size=int(24 * scale_factor), color=WHITE)
-                new_id_text.move_to(id_boxes[i].get_center())
+                new_id_text = self.build_id_text(token_id, id_boxes[i])
                 self.play(Transform(id_texts[i], new_id_text))
-                
+            
                 # 6. Clean up highlights and arrows for this iteration
-                self.play(
-                    FadeOut(token_highlight),
-                    FadeOut(vocab_highlight), 
-                    FadeOut(lookup_arrow),
-                    FadeOut(mapping_arrow)
-                )
+                self.play(*highlights.hide("token", "vocab", "lookup", "mapping"))
             else:
                 # Fallback if vocab entry not found - just populate the ID box
-                new_id_text = Text(str(token_id), font_size=int(24 * scale_factor), color=WHITE)
-                new_id_text.move_to(id_boxes[i].get_center())
+                new_id_text = self.build_id_text(token_id, id_boxes[i])
                 self.play(
                     Transform(id_texts[i], new_id_text),
-                    FadeOut(token_highlight)
+                    *highlights.hide("token")
                 )
-            
+        
             # Brief pause between tokens
             self.wait(0.3)
-        
-        # Final step: Show the complete input IDs array
-        ids_label_str = '[' + ', '.join(str(i) for i in input_ids) + ']'
-        ids_label = Text(f"{ids_label_str}", font_size=int(30 * scale_factor), color=RED)
-        ids_label.move_to(LEFT * 2 + DOWN * 3)
-        
-        final_arrows = []
-        for i, id_box in enumerate(id_boxes):
-            arrow = Arrow(
-                start=id_box.get_bottom(),
-                end=ids_label.get_top(), 
-                color=YELLOW_B, 
-                stroke_width=3 * scale_factor
-            )
-            final_arrows.append(arrow)
-        
-        # First animate the arrows
-        self.play(
-            *[GrowArrow(arrow) for arrow in final_arrows]
-        )
+        highlights.remove_from(self)
+        return input_ids
 
-        # Then display the ids_label
-        self.play(
-            Write(ids_label)
-        )
+    def play_lookups_pipelined(self, vocab_component, id_boxes, id_texts):
+        """Play the tokens' lookups as timelines, overlapping adjacent tokens
 
+        A windowed vocabulary can only show one window per play, so the
+        timeline is cut wherever the next token needs the window to jump: the
+        lookups so far are played, the window moves, and a new timeline starts.
+        """
+        scale_factor = self.lookup_scale
+        stage_time = self.lookup_stage_time
+        input_ids = []
+        timelines = []
+        # Overlapping tokens need their own highlights: each token takes the
+        # first slot whose previous token has finished by the time it starts
+        highlights = HighlightPool(reuse=self.reuse_highlights)
+        slot_free_at = []
+        start_time = 0
+        for i, token in enumerate(self.tokens):
+            token_id = self.data.input_ids[i]
+            input_ids.append(token_id)
+            if vocab_component.needs_jump(token):
+                self.play_lookup_timelines(timelines)
+                timelines = []
+                slot_free_at = []
+                start_time = 0
+            
+            new_id_text = self.build_id_text(token_id, id_boxes[i])
+            # Moves the window between plays if needed, like the step mode
+            vocab_entry_mobject = vocab_component.get_token_mobject(token)
+            if vocab_entry_mobject:
+                duration = 6 * stage_time
+            else:
+                duration = 3 * stage_time
+            slot = next(
+                (k for k, free_at in enumerate(slot_free_at) if free_at <= start_time + 1e-6),
+                len(slot_free_at),
+            )
+            if slot == len(slot_free_at):
+                slot_free_at.append(0)
+            slot_free_at[slot] = start_time + duration
+            start_time += self.lookup_lag_ratio * duration
+            names = [f"{kind}{slot}" for kind in ("token", "vocab", "lookup", "mapping")]
+            highlight_token = highlights.surround(
+                names[0], self.token_boxes[i], color=YELLOW, stroke_width=4, buff=0.1,
+                run_time=stage_time
+            )
 
-                
+            if vocab_entry_mobject:
+                stages = [
+                    highlight_token,
+                    highlights.surround(
+                        names[1], vocab_entry_mobject, color=ORANGE, stroke_width=3,
+                        run_time=stage_time
+                    ),
+                    highlights.arrow(
+                        names[2], self.token_boxes[i].get_right(), vocab_entry_mobject.get_left(),
+                        color=GREEN, stroke_width=3 * scale_factor, run_time=stage_time
+                    ),
+                    highlights.arrow(
+                        names[3], vocab_entry_mobject.get_bottom(), id_boxes[i].get_top(),
+                        color=BLUE, stroke_width=3 * scale_factor, run_time=stage_time
+                    ),
+                    Transform(id_texts[i], new_id_text, run_time=stage_time),
+                    AnimationGroup(*highlights.hide(*names), run_time=stage_time),
+                ]
+            else:
+                stages = [
+                    highlight_token,
+                    Transform(id_texts[i], new_id_text, run_time=stage_time),
+                    *highlights.hide(names[0], run_time=stage_time),
+                ]
+            # Only the ID text is on screen before the timeline starts; the
+            # highlights and arrows are added by their own stages
+            timelines.append(Succession(*stages, group=Group(id_texts[i])))
         
-        # Store for next step
-        self.input_ids = input_ids
-        self.id_boxes = id_boxes
-        self.id_texts = id_texts
-        self.ids_group = VGroup(*id_boxes, *id_texts)
+        self.play_lookup_timelines(timelines)
+        highlights.remove_from(self)
+        return input_ids
         
+    def play_lookup_timelines(self, timelines):
+        if timelines:
+            self.play(AnimationGroup(*timelines, lag_ratio=self.lookup_lag_ratio))
+
     def step_4_input_embeddings(self):
         """Step 4: Convert input IDs to embeddings"""
-        step4_title = Text("Step 4: Input IDs to Embeddings", 
-                          font_size=28, color=GREEN).move_to(UP * 2.5)
-        
+        step4_title = self.build_step_title("step_4_input_embeddings")
+
         self.play(Transform(self.step1_title, step4_title))
-        
-        # Clear previous elements and focus on embeddings
+
+        # Clear everything but the title and the ID boxes, which move above
+        # the output vectors
+        keep = set(self.step1_title.get_family()) | set(self.ids_group.get_family())
+        cleared = self.split_off(self.mobjects, keep)
+        self.unfreeze(*cleared)
+        ids_scale = min(1, EMBEDDING_VECTORS_WIDTH / self.ids_group.width, 1.2 / self.ids_group.height)
         self.play(
-            FadeOut(VGroup(*self.token_boxes, *self.token_texts)),
-            self.ids_group.animate.move_to(UP * 1)
+            FadeOut(*cleared),
+            self.ids_group.animate.scale(ids_scale).move_to(RIGHT * EMBEDDING_VECTORS_X + UP * 2.5)
         )
-        
-        # Create embedding matrix representation
-        embedding_dim = 4  # Small embedding dimension for visualization
-        
+
+        # Embeddings of the distinct input IDs, gathered in a single read
+        table_ids = self.data.table_ids
+        embedding_rows = self.data.table_embeddings
+        embedding_dim = self.data.embedding_dim
+        embedding_vectors = self.data.embeddings
+
         # Show embedding lookup table
-        embed_title = Text("Embedding Matrix (vocab_size × embedding_dim)", 
+        embed_title = Text("Embedding Matrix (vocab_size × embedding_dim)",
                           font_size=18, color=YELLOW)
-        embed_title.move_to(LEFT * 4 + UP * 1.5)
-        
+        if embed_title.width > EMBEDDING_TABLE_WIDTH + 1:
+            embed_title.scale_to_fit_width(EMBEDDING_TABLE_WIDTH + 1)
+        embed_title.move_to(LEFT * 4.3 + UP * 1.5)
+
+        # Add row labels (token IDs); with too many rows to read only every
+        # few keep their label
+        row_pitch = self.get_table_row_pitch()
+        label_every = math.ceil(0.2 / row_pitch)
+        id_labels = []
+        for i, token_id in enumerate(table_ids):  # Our input IDs
+            if i % label_every:
+                continue
+            label = cached_text(f"ID {token_id}:", font_size=14, color=RED)
+            label.scale(min(1, 0.9 / label.width, row_pitch * 0.8 / label.height))
+            label.move_to(LEFT * 6.3 + UP * (EMBEDDING_TABLE_TOP - (i + 0.5) * row_pitch))
+            id_labels.append(label)
+
+        if self.embedding_cells_fit():
+            self.play_embedding_cells(
+                embed_title, id_labels, np.round(embedding_rows, 2), np.round(embedding_vectors, 2)
+            )
+        else:
+            self.play_embedding_heatmaps(embed_title, id_labels, embedding_rows, embedding_vectors)
+
+        # Final summary
+        summary = Text("Input Embeddings: Dense vector representations ready for transformer!",
+                      font_size=18, color=GREEN)
+        summary.move_to(DOWN * 3.5)
+        self.play(Write(summary))
+
+        # Add dimension info
+        dim_info = Text(f"Shape: (sequence_length={len(self.input_ids)}, embedding_dim={embedding_dim})",
+                       font_size=14, color=GRAY)
+        dim_info.move_to(DOWN * 3.8)
+        self.play(Write(dim_info))
+        self.wait(2)
+
+    def split_off(self, mobjects, keep):
+        """Return the largest pieces of mobjects whose families share nothing with keep"""
+        pieces = []
+        for mobject in mobjects:
+            if keep.isdisjoint(mobject.get_family()):
+                pieces.append(mobject)
+            elif mobject not in keep:
+                pieces.extend(self.split_off(mobject.submobjects, keep))
+        return pieces
+
+    def embedding_cells_fit(self):
+        """Whether step 4 can draw one Rectangle and Text per value and stay on frame"""
+        return (
+            self.data.embedding_dim <= self.embedding_display_dim
+            and self.get_table_row_pitch() >= 0.25
+            and self.get_vector_columns()[0] >= 0.6
+        )
+
+    def get_table_row_pitch(self):
+        # Rows are squeezed until the table fits its height
+        return min(0.4, EMBEDDING_TABLE_HEIGHT / len(self.data.table_ids))
+
+    def get_vector_columns(self):
+        """Return the pitch and x of the output vectors' columns, spread over the vectors' width"""
+        count = len(self.input_ids)
+        pitch = min(2.5, EMBEDDING_VECTORS_WIDTH / count)
+        return pitch, [EMBEDDING_VECTORS_X + (i - (count - 1) / 2) * pitch for i in range(count)]
+
+    def build_vector_labels(self, columns, pitch):
+        """Label the output vectors E1, E2, ... above their columns, skipping some when crowded"""
+        label_every = math.ceil(0.5 / pitch)
+        vector_labels = []
+        for i, x_pos in enumerate(columns):
+            if i % label_every:
+                continue
+            vector_label = cached_text(f"E{i+1}", font_size=16, color=PURPLE)
+            vector_label.move_to(RIGHT * x_pos + UP * (EMBEDDING_VECTORS_TOP + 0.3))
+            vector_labels.append(vector_label)
+        return vector_labels
+
+    def build_embedding_arrows(self, columns):
+        # From each ID box to just above its vector's label
+        return self.build_arrows(
+            [id_box.get_bottom() for id_box in self.id_boxes],
+            [RIGHT * x_pos + UP * (EMBEDDING_VECTORS_TOP + 0.5) for x_pos in columns],
+            color=PURPLE, stroke_width=3
+        )
+
+    def play_embedding_cells(self, embed_title, id_labels, table_values, embedding_vectors):
+        """Draw the table and output vectors with one Rectangle and Text per value"""
+        shown_dim = table_values.shape[1]
+        row_pitch = self.get_table_row_pitch()
+        cell_width = min(0.8, EMBEDDING_TABLE_WIDTH / shown_dim)
+
         # Create a simplified embedding matrix visualization
         embed_matrix = []
-        for i in range(3):  # Show only relevant embeddings
+        for i, row_values in enumerate(table_values):  # Show only relevant embeddings
             row = []
-            for j in range(embedding_dim):
-                # Generate some example embedding values
-                value = round(np.random.normal(0, 0.5), 2)
-                cell = Rectangle(width=0.8, height=0.4, color=BLUE, fill_opacity=0.2)
-                cell.move_to(LEFT * 4 + LEFT * (j - 1.5) * 0.8 + DOWN * i * 0.4)
-                
-                text = Text(str(value), font_size=12, color=WHITE)
+            for j, value in enumerate(row_values):
+                cell = Rectangle(width=cell_width, height=row_pitch, color=BLUE, fill_opacity=0.2)
+                cell.move_to(RIGHT * (EMBEDDING_TABLE_X + (j - (shown_dim - 1) / 2) * cell_width)
+                             + UP * (EMBEDDING_TABLE_TOP - (i + 0.5) * row_pitch))
+
+                text = cached_text(str(value), font_size=12, color=WHITE)
                 text.move_to(cell.get_center())
-                
+
                 row.append(VGroup(cell, text))
             embed_matrix.append(row)
-        
-        # Add row labels (token IDs)
-        id_labels = []
-        for i, token_id in enumerate([1, 5, 8]):  # Our input IDs
-            label = Text(f"ID {token_id}:", font_size=14, color=RED)
-            label.move_to(LEFT * 5.5 + DOWN * i * 0.4)
-            id_labels.append(label)
-        
+
         # Animate embedding matrix
         self.play(
             Write(embed_title),
@@ -372,59 +1007,64 @@ class TransformerWorkflow(Scene):
             *[DrawBorderThenFill(cell[0]) for row in embed_matrix for cell in row],
             *[Write(cell) for row in embed_matrix for cell in row]
         )
-        
-        # Create final embedding vectors
-        embedding_vectors = []
+
+        # Create final embedding vectors from the same gathered rows
+        pitch, columns = self.get_vector_columns()
         vector_groups = []
-        
-        for i, token_id in enumerate(self.input_ids):
-            x_pos = (i - len(self.input_ids)/2 + 0.5) * 2.5
-            
+
+        for i, x_pos in enumerate(columns):
             # Create vertical vector representation
             vector_cells = []
-            for j in range(embedding_dim):
-                cell = Rectangle(width=0.6, height=0.4, 
+            for j, value in enumerate(embedding_vectors[i]):
+                cell = Rectangle(width=min(0.6, pitch * 0.8), height=0.4,
                                color=PURPLE, fill_opacity=0.4)
-                cell.move_to(RIGHT * x_pos + DOWN * (2 + j * 0.4))
-                
-                # Generate embedding values
-                value = round(np.random.normal(0, 0.5), 2)
-                text = Text(str(value), font_size=10, color=WHITE)
+                cell.move_to(RIGHT * x_pos + UP * (EMBEDDING_VECTORS_TOP - (j + 0.5) * 0.4))
+
+                text = cached_text(str(value), font_size=10, color=WHITE)
                 text.move_to(cell.get_center())
-                
+
                 vector_cells.append(VGroup(cell, text))
-            
-            vector_group = VGroup(*vector_cells)
-            vector_groups.append(vector_group)
-            
-            # Add vector label
-            vector_label = Text(f"E{i+1}", font_size=16, color=PURPLE)
-            vector_label.move_to(RIGHT * x_pos + DOWN * 1.5)
-            vector_groups[i].add(vector_label)
-        
+
+            vector_groups.append(VGroup(*vector_cells))
+        vector_labels = self.build_vector_labels(columns, pitch)
+
         # Animate the embedding lookup
-        lookup_arrows = []
-        for i, (id_box, vector_group) in enumerate(zip(self.id_boxes, vector_groups)):
-            arrow = Arrow(start=id_box.get_bottom(),
-                         end=vector_group[0].get_top(), color=PURPLE, stroke_width=3)
-            lookup_arrows.append(arrow)
-        
+        lookup_arrows = self.build_embedding_arrows(columns)
+
         self.play(
-            *[GrowArrow(arrow) for arrow in lookup_arrows],
-            *[DrawBorderThenFill(cell[0]) for vector in vector_groups for cell in vector[:-1]],
-            *[Write(cell) for vector in vector_groups for cell in vector[:-1]],
-            *[Write(vector[-1]) for vector in vector_groups]  # Labels
+            *self.grow_arrows(lookup_arrows),
+            *[DrawBorderThenFill(cell[0]) for vector in vector_groups for cell in vector],
+            *[Write(cell) for vector in vector_groups for cell in vector],
+            *[Write(label) for label in vector_labels]
+        )
+
+    def play_embedding_heatmaps(self, embed_title, id_labels, embedding_rows, embedding_vectors):
+        """Draw the table and output vectors as heatmaps, for wide or numerous embeddings"""
+        embed_heatmap = MatrixHeatmap(
+            embedding_rows, width=EMBEDDING_TABLE_WIDTH,
+            height=len(embedding_rows) * self.get_table_row_pitch()
+        )
+        embed_heatmap.move_to(RIGHT * EMBEDDING_TABLE_X + UP * EMBEDDING_TABLE_TOP, aligned_edge=UP)
+
+        self.play(
+            Write(embed_title),
+            *[Write(label) for label in id_labels],
+            FadeIn(embed_heatmap)
+        )
+
+        # One column per token: (embedding_dim, sequence_length)
+        pitch, columns = self.get_vector_columns()
+        vectors_heatmap = MatrixHeatmap(
+            embedding_vectors.T, width=pitch * len(columns),
+            height=min(0.4 * embedding_vectors.shape[1], 3),
+            vmin=embed_heatmap.vmin, vmax=embed_heatmap.vmax
+        )
+        vectors_heatmap.move_to(RIGHT * EMBEDDING_VECTORS_X + UP * EMBEDDING_VECTORS_TOP, aligned_edge=UP)
+        vector_labels = self.build_vector_labels(columns, pitch)
+        lookup_arrows = self.build_embedding_arrows(columns)
+
+        self.play(
+            *self.grow_arrows(lookup_arrows),
+            FadeIn(vectors_heatmap),
+            *[Write(label) for label in vector_labels]
         )
-        
-        # Final summary
-        summary = Text("Input Embeddings: Dense vector representations ready for transformer!",
-                      font_size=18, color=GREEN)
-        summary.move_to(DOWN * 3.5)
-        self.play(Write(summary))
-        
-        # Add dimension info
-        dim_info = Text(f"Shape: (sequence_length={len(self.input_ids)}, embedding_dim={embedding_dim})",
-                       font_size=14, color=GRAY)
-        dim_info.move_to(DOWN * 3.8)
-        self.play(Write(dim_info))
-        self.wait(2)
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""Data behind TransformerWorkflow, computed once before any mobject is built
+
+Keeping the numbers out of the mobject-building code means every run with the
+same inputs builds identical mobjects, so manim's partial-movie cache (which
+hashes each play's mobjects) keeps hitting across renders.
+"""
+from embeddings import gather_rows, open_embedding_table
+from tokenizer import token_to_id
+
+# numpy is imported where the numbers are computed, so the data layer can be
+# imported without it
+
+
+class TransformerData:
+    def __init__(self, sentence, tokens, input_ids, vocab, table_ids, table_embeddings,
+                 weights, seed):
+        self.sentence = sentence
+        self.tokens = tokens
+        self.input_ids = input_ids
+        self.vocab = vocab
+        # Distinct input IDs in order of appearance and their embedding rows
+        self.table_ids = table_ids
+        self.table_embeddings = table_embeddings
+        # Projection weights (W_q, W_k, W_v, W_o), each embedding_dim × embedding_dim
+        self.weights = weights
+        self.seed = seed
+
+    @property
+    def embedding_dim(self):
+        return self.table_embeddings.shape[1]
+
+    @property
+    def embeddings(self):
+        """Embedding of every token in the sequence, (sequence_length, embedding_dim)"""
+        rows = {token_id: i for i, token_id in enumerate(self.table_ids)}
+        return self.table_embeddings[[rows[token_id] for token_id in self.input_ids]]
+
+    def attention(self, num_heads=1):
+        """Compute every head's attention over the embeddings in one batched pass
+
+        Returns a dict of arrays: "Q", "K", "V" and "output" are
+        (num_heads, sequence_length, head_dim), "scores" (QKᵀ/√head_dim) and
+        "weights" (their row-wise softmax) are (num_heads, sequence_length,
+        sequence_length). Head h uses columns h*head_dim:(h+1)*head_dim of
+        W_q, W_k and W_v.
+        """
+        import numpy as np
+
+        if self.embedding_dim % num_heads:
+            raise ValueError(f"embedding_dim {self.embedding_dim} is not divisible by {num_heads} heads")
+        head_dim = self.embedding_dim // num_heads
+        x = self.embeddings
+        # One product for all three projections, then split into heads
+        w_qkv = np.concatenate([self.weights[name] for name in ("W_q", "W_k", "W_v")], axis=1)
+        qkv = (x @ w_qkv).reshape(len(x), 3, num_heads, head_dim).transpose(1, 2, 0, 3)
+        q, k, v = qkv
+        scores = q @ k.transpose(0, 2, 1) / np.sqrt(head_dim)
+        weights = np.exp(scores - scores.max(axis=-1, keepdims=True))
+        weights /= weights.sum(axis=-1, keepdims=True)
+        return {"Q": q, "K": k, "V": v, "scores": scores, "weights": weights, "output": weights @ v}
+
+    @classmethod
+    def build(cls, sentence, vocab, tokens=None, tokenizer=None, seed=0, embedding_path=None,
+              embedding_shape=None, embedding_dim=4):
+        """Tokenize the sentence (unless tokens, e.g. one page of it, are given), look up IDs and gather embeddings"""
+        import numpy as np
+
+        if tokens is None:
+            tokens = tokenizer.tokenize(sentence) if tokenizer is not None else sentence.split()
+        if tokenizer is not None:
+            input_ids = [tokenizer.token_to_id(token) for token in tokens]
+        else:
+            input_ids = [token_to_id(vocab, token) for token in tokens]
+
+        table_ids = list(dict.fromkeys(input_ids))
+        if embedding_path:
+            table = open_embedding_table(embedding_path, embedding_shape)
+            table_embeddings = gather_rows(table, table_ids)
+            embedding_dim = table_embeddings.shape[1]
+        else:
+            # Each ID's row depends only on (seed, ID), whatever the sentence
+            table_embeddings = np.array([
+                np.random.default_rng([seed, token_id]).normal(0, 0.5, embedding_dim)
+                for token_id in table_ids
+            ]).reshape(len(table_ids), embedding_dim)
+
+        rng = np.random.default_rng(seed)
+        scale = 1 / np.sqrt(embedding_dim)
+        weights = {
+            name: rng.normal(0, scale, size=(embedding_dim, embedding_dim))
+            for name in ("W_q", "W_k", "W_v", "W_o")
+        }
+        return cls(sentence, tokens, input_ids, vocab, table_ids, table_embeddings, weights, seed)